@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import (QFrame, QHBoxLayout, QLineEdit, QComboBox, QFormLay
                            QVBoxLayout, QLabel, QPushButton, QMessageBox, QWidget, QSizePolicy, QApplication,
                            QMenu, QAction)
 from PyQt5.QtCore import Qt, QMimeData, QPoint, pyqtSignal, QRect, QRectF, QSize
-from PyQt5.QtGui import QDrag, QColor, QPainter, QPen, QBrush, QLinearGradient, QPainterPath, QFont
+from PyQt5.QtGui import QDrag, QColor, QPainter, QPen, QBrush, QLinearGradient, QPainterPath, QFont, QPixmap
 
 import json
 import logging
@@ -330,6 +330,11 @@ class CodeBlock(QFrame):
         self.is_selected = False
         self.drag_start_position = None
         self.can_be_freely_positioned = True  # Allow free positioning by default
+
+        # Cached rendering of the block body; re-rasterized only when
+        # the size, selection state or block-style settings change
+        self._body_pixmap = None
+        self._body_key = None
         
         # Load block definition from settings
         self.block_definition = block_data or settings.get_block_definition(block_type) or {}
@@ -1142,20 +1147,41 @@ class CodeBlock(QFrame):
     
     def paintEvent(self, event):
         """Custom paint event to draw the block with gradient background and selection highlight"""
+        rounding = settings.get_app_setting("blocks", "block_rounding", default=8)
+        shadows = settings.get_app_setting("blocks", "block_shadows", default=True)
+        ratio = self.devicePixelRatioF()
+
+        # Blit the cached body pixmap; only re-rasterize when something
+        # that affects the body actually changed
+        key = (self.width(), self.height(), self.is_selected, rounding, shadows, ratio)
+        if self._body_pixmap is None or self._body_key != key:
+            pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            self._render_body(pixmap, rounding, shadows)
+            self._body_pixmap = pixmap
+            self._body_key = key
+
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._body_pixmap)
+        painter.end()
+
+        # Let the normal rendering continue for child widgets
+        super().paintEvent(event)
+
+    def _render_body(self, pixmap, rounding, shadows):
+        """Rasterize the block body (shadow, gradient, border) into a pixmap"""
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
-        
+
         # Block shape
         block_rect = QRectF(self.rect()).adjusted(2, 2, -2, -2)
         path = QPainterPath()
-        
-        # Use block_rounding setting from app settings
-        rounding = settings.get_app_setting("blocks", "block_rounding", default=8)
-        
+
         path.addRoundedRect(block_rect, rounding, rounding)
         
         # Draw drop shadow first (if enabled)
-        if settings.get_app_setting("blocks", "block_shadows", default=True):
+        if shadows:
             shadow_path = QPainterPath()
             shadow_rect = QRectF(block_rect).adjusted(1, 1, 1, 1)
             shadow_path.addRoundedRect(shadow_rect, rounding, rounding)
@@ -1200,9 +1226,8 @@ class CodeBlock(QFrame):
             border_color = QColor(base_color.darker(130))
             painter.setPen(QPen(border_color, 1.5))
             painter.drawPath(path)
-        
-        # Let the normal rendering continue for child widgets
-        super().paintEvent(event)
+
+        painter.end()
     
     def to_json(self) -> Dict[str, Any]:
         """Serialize the block to JSON"""
@@ -7,17 +7,16 @@ import time
 from typing import Dict, Any, Optional
 
 from PyQt5.QtCore import Qt, QSize, QTimer
-from PyQt5.QtGui import QIcon, QKeySequence
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QAction, QFileDialog,
                            QSplitter, QMessageBox, QStatusBar, QToolBar,
-                           QVBoxLayout, QHBoxLayout, QWidget, QLabel, QShortcut)
+                           QVBoxLayout, QWidget, QShortcut)
 
 from settings_loader import settings
 from block_palette import BlockPalette
 from workspace_widget import WorkspaceWidget
 from output_panel import OutputPanel
 from code_tree import CodeTree
-from utils import ensure_directory_exists, format_code
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +36,11 @@ class MainWindow(QMainWindow):
         # State management
         self.current_file_path = None
         self.code_changed_since_save = False
+
+        # Window title cache: app name doesn't change at runtime, and the
+        # title only needs rebuilding when the file path or dirty flag change
+        self._app_name = settings.get_app_setting("application", "name", default="Python Block Code Editor")
+        self._title_key = None
         
         # Initialize UI
         self.init_ui()
@@ -333,7 +337,7 @@ class MainWindow(QMainWindow):
         
         # This is just a temporary change for the session
         # A more complete implementation would update the settings file
-        settings.app_settings["ui"]["theme"] = new_theme
+        settings.set_app_setting("ui", "theme", new_theme)
         
         # Update UI
         self.update_style()
@@ -409,8 +413,11 @@ class MainWindow(QMainWindow):
         """Open a project file"""
         if not self.check_unsaved_changes():
             return
-        
+
         # Get default directory from settings
+        # Imported lazily to keep utils (and its optional numpy import)
+        # off the startup path
+        from utils import ensure_directory_exists
         default_dir = settings.get_app_setting("application", "default_save_path", default="./projects")
         ensure_directory_exists(default_dir)
         
@@ -433,6 +440,7 @@ class MainWindow(QMainWindow):
     def on_save_as(self):
         """Save the project to a new file"""
         # Get default directory from settings
+        from utils import ensure_directory_exists
         default_dir = settings.get_app_setting("application", "default_save_path", default="./projects")
         ensure_directory_exists(default_dir)
         
@@ -755,8 +763,15 @@ class MainWindow(QMainWindow):
     
     def update_window_title(self):
         """Update the window title based on current file and save state"""
-        app_name = settings.get_app_setting("application", "name", default="Python Block Code Editor")
-        
+        # Skip the string work (and the redundant setWindowTitle, which
+        # still fires Qt signals) if nothing relevant changed
+        title_key = (self.current_file_path, self.code_changed_since_save)
+        if title_key == self._title_key:
+            return
+        self._title_key = title_key
+
+        app_name = self._app_name
+
         if self.current_file_path:
             file_name = os.path.basename(self.current_file_path)
             if self.code_changed_since_save:
@@ -1,7 +1,10 @@
 import logging
+import re
+from functools import lru_cache
+from html import escape
 from typing import Optional
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QPoint, QTimer
 from PyQt5.QtGui import QFont, QColor, QPalette
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSplitter, 
                            QTextEdit, QLabel, QPushButton, QFrame)
@@ -12,14 +15,67 @@ from settings_loader import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('output_panel')
 
+# Python keywords and builtins for highlighting, as frozensets for O(1)
+# membership tests per token
+_KEYWORDS = frozenset([
+    'and', 'as', 'assert', 'break', 'class', 'continue', 'def', 'del', 'elif',
+    'else', 'except', 'finally', 'for', 'from', 'global', 'if', 'import', 'in',
+    'is', 'lambda', 'not', 'or', 'pass', 'raise', 'return', 'try', 'while', 'with', 'yield'
+])
+
+_BUILTINS = frozenset([
+    'abs', 'all', 'any', 'bool', 'chr', 'dict', 'dir', 'enumerate', 'eval', 'exec',
+    'filter', 'float', 'format', 'frozenset', 'getattr', 'hasattr', 'hex', 'id',
+    'input', 'int', 'isinstance', 'issubclass', 'len', 'list', 'map', 'max', 'min',
+    'next', 'object', 'open', 'ord', 'pow', 'print', 'property', 'range', 'repr',
+    'reversed', 'round', 'set', 'setattr', 'slice', 'sorted', 'str', 'sum', 'super',
+    'tuple', 'type', 'vars', 'zip'
+])
+
+# Splits a line into identifier and non-identifier segments in one pass
+_IDENT_SPLIT = re.compile(r'(\b[A-Za-z_]\w*\b)')
+
+# Closing scaffolding for the highlighted preview; the theme-dependent
+# head is cached per theme in update_style
+_CODE_HTML_TAIL = """
+        </table>
+        </body>
+        </html>
+        """
+
+@lru_cache(maxsize=8)
+def _monospace_font(family: str, size: int) -> QFont:
+    """Build (and cache) a fixed-pitch QFont for the given family/size"""
+    font = QFont(family, size)
+    font.setFixedPitch(True)
+    return font
+
 class OutputPanel(QWidget):
     """
     Panel displaying the generated Python code and execution output.
     Provides code highlighting and execution results.
     """
+    # Extra lines highlighted above/below the visible window so small
+    # scrolls don't immediately hit unhighlighted text
+    HIGHLIGHT_MARGIN = 100
+
+    # Above this many characters the preview switches to plain text:
+    # a responsive display beats a multi-second highlight freeze
+    BIG_TEXT_THRESHOLD = 30000
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        
+
+        # Code currently shown in the preview (plain text, cleaned)
+        self._preview_code = ""
+
+        # Guard flag to avoid re-entrant scroll handling when we restore
+        # the scrollbar position after a re-render
+        self._restoring_scroll = False
+
+        # Font setup is deferred until the panel is first shown
+        self._deferred_setup_done = False
+
         # Setup UI
         self.init_ui()
     
@@ -52,46 +108,56 @@ class OutputPanel(QWidget):
         self.layout.addWidget(self.splitter)
         
         # Code preview section
+        # Font configuration is deferred to the first showEvent so QFont
+        # construction stays off the startup path
         self.code_preview = QTextEdit()
         self.code_preview.setReadOnly(True)
-        self.setup_code_preview()
         self.splitter.addWidget(self.code_preview)
-        
+
         # Execution output section
         self.execution_output = QTextEdit()
         self.execution_output.setReadOnly(True)
-        self.setup_execution_output()
         self.splitter.addWidget(self.execution_output)
         
         # Set initial sizes
         self.splitter.setSizes([int(self.height() * 0.6), int(self.height() * 0.4)])
-        
+
+        # Re-highlight lazily when the preview is scrolled: coalesce rapid
+        # scroll events into a single re-render via a single-shot timer
+        self._rehighlight_timer = QTimer(self)
+        self._rehighlight_timer.setSingleShot(True)
+        self._rehighlight_timer.setInterval(100)
+        self._rehighlight_timer.timeout.connect(self.refresh_visible_highlighting)
+        self.code_preview.verticalScrollBar().valueChanged.connect(self.on_preview_scrolled)
+
         # Apply theme
         self.update_style()
-    
+
+    def showEvent(self, event):
+        """Run deferred setup the first time the panel becomes visible"""
+        super().showEvent(event)
+        if not self._deferred_setup_done:
+            self._deferred_setup_done = True
+            self.setup_code_preview()
+            self.setup_execution_output()
+
     def setup_code_preview(self):
         """Configure the code preview text edit"""
-        # Set monospace font
+        # Set monospace font (shared cached instance)
         font_family = settings.get_app_setting("ui", "font_family", default="Consolas, 'Courier New', monospace")
         font_size = settings.get_app_setting("ui", "font_size", default=12)
-        
-        font = QFont(font_family.split(',')[0].strip(), font_size)
-        font.setFixedPitch(True)
-        self.code_preview.setFont(font)
-        
+        self.code_preview.setFont(_monospace_font(font_family.split(',')[0].strip(), font_size))
+
         # Set header
         self.code_preview.setPlaceholderText("Code preview will appear here")
-    
+
     def setup_execution_output(self):
         """Configure the execution output text edit"""
-        # Set monospace font
+        # Set monospace font (shared cached instance)
         font_family = settings.get_app_setting("ui", "font_family", default="Consolas, 'Courier New', monospace")
         font_size = settings.get_app_setting("ui", "font_size", default=12)
-        
-        font = QFont(font_family.split(',')[0].strip(), font_size)
-        font.setFixedPitch(True)
-        self.execution_output.setFont(font)
-        
+        self.execution_output.setFont(_monospace_font(font_family.split(',')[0].strip(), font_size))
+
         # Set header
         self.execution_output.setPlaceholderText("Execution output will appear here")
     
@@ -151,6 +217,66 @@ class OutputPanel(QWidget):
                 background-color: rgba(255, 255, 255, 0.3);
             }}
         """)
+
+        # Precompute the HTML/CSS header used by apply_syntax_highlighting.
+        # It only depends on theme colors, so rebuild it here (on theme change)
+        # instead of on every code preview render.
+        self._code_css_header = self.build_code_css_header(theme)
+
+    def build_code_css_header(self, theme: dict) -> str:
+        """
+        Build the HTML scaffolding (including the CSS style block) used
+        for the highlighted code preview.
+
+        Args:
+            theme: The current theme dictionary
+
+        Returns:
+            HTML header string up to and including the opening table tag
+        """
+        bg_color = theme.get("panel_color", "#ffffff")
+
+        # Define colors for different syntax elements
+        colors = {
+            'keyword': "#0000FF",  # blue
+            'builtin': "#990000",  # dark red
+            'string': "#008800",   # green
+            'comment': "#888888",  # gray
+            'number': "#FF8800",   # orange
+            'function': "#660066", # purple
+            'class': "#0066BB",    # dark blue
+            'operator': "#666600", # olive
+        }
+
+        return f"""
+        <html>
+        <head>
+        <style>
+            body {{ background-color: {bg_color}; font-family: monospace; white-space: pre; }}
+            .keyword {{ color: {colors['keyword']}; font-weight: bold; }}
+            .builtin {{ color: {colors['builtin']}; }}
+            .string {{ color: {colors['string']}; }}
+            .comment {{ color: {colors['comment']}; font-style: italic; }}
+            .number {{ color: {colors['number']}; }}
+            .function {{ color: {colors['function']}; }}
+            .class {{ color: {colors['class']}; font-weight: bold; }}
+            .operator {{ color: {colors['operator']}; }}
+            .line-number {{
+                color: {colors['comment']};
+                display: inline-block;
+                width: 30px;
+                text-align: right;
+                margin-right: 10px;
+                user-select: none;
+                -webkit-user-select: none;
+                border-right: 1px solid {colors['comment']};
+                padding-right: 5px;
+            }}
+        </style>
+        </head>
+        <body>
+        <table border="0" cellspacing="0" cellpadding="0" style="border-collapse: collapse; width: 100%;">
+        """
     
     def set_code_preview(self, code: str):
         """
@@ -161,10 +287,105 @@ class OutputPanel(QWidget):
         """
         # Clean and normalize the code to prevent indentation errors
         cleaned_code = self.clean_code(code)
-        
-        # Apply syntax highlighting
-        highlighted_code = self.apply_syntax_highlighting(cleaned_code)
-        self.code_preview.setHtml(highlighted_code)
+        self._preview_code = cleaned_code
+
+        # Very large previews skip highlighting entirely ("big text" mode)
+        if len(cleaned_code) > self.BIG_TEXT_THRESHOLD:
+            self.code_preview.setPlainText(cleaned_code)
+            return
+
+        # Apply syntax highlighting only to the visible window; the rest is
+        # rendered as plain text and highlighted lazily on scroll. A fresh
+        # document starts scrolled to the top, so the window starts at line 0
+        # (probing the previous document here would yield a stale range);
+        # the on-screen row count is estimated from the font's line spacing,
+        # with HIGHLIGHT_MARGIN absorbing any estimation error.
+        viewport_rows = (self.code_preview.viewport().height() //
+                         max(1, self.code_preview.fontMetrics().lineSpacing()))
+        highlighted_code = self.apply_syntax_highlighting(
+            cleaned_code, 0, viewport_rows + self.HIGHLIGHT_MARGIN)
+
+        # Suppress repaints and signals during the bulk update so Qt does a
+        # single relayout/repaint instead of many intermediate ones
+        self.code_preview.setUpdatesEnabled(False)
+        self.code_preview.blockSignals(True)
+        try:
+            self.code_preview.setHtml(highlighted_code)
+        finally:
+            self.code_preview.blockSignals(False)
+            self.code_preview.setUpdatesEnabled(True)
+            self.code_preview.viewport().update()
+
+    def visible_line_range(self) -> tuple:
+        """
+        Determine which lines of the preview are currently on screen,
+        expanded by HIGHLIGHT_MARGIN on each side.
+
+        Returns:
+            Tuple of (first_line, last_line) indices (0-based)
+        """
+        viewport = self.code_preview.viewport()
+        # Probe mid-viewport: at x=0 the cursor lands in the root frame
+        # outside the table and always reports the first block
+        x = max(0, viewport.width() // 2)
+        first = self._preview_row_at(QPoint(x, 0))
+        last = self._preview_row_at(QPoint(x, max(0, viewport.height() - 1)))
+
+        # Points outside the table (short documents, not yet laid out)
+        # fall back to covering the whole preview
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = self._preview_code.count('\n')
+
+        return max(0, first - self.HIGHLIGHT_MARGIN), last + self.HIGHLIGHT_MARGIN
+
+    def _preview_row_at(self, point: QPoint) -> int:
+        """
+        Map a viewport point to its table row in the code preview.
+
+        The preview is rendered as an HTML table with one row per code
+        line, so the row index is the 0-based line number. Block numbers
+        are useless here: every <td> cell is its own text block.
+
+        Returns:
+            The 0-based row index, or -1 if the point is outside the table
+        """
+        cursor = self.code_preview.cursorForPosition(point)
+        table = cursor.currentTable()
+        if table is None:
+            return -1
+        return table.cellAt(cursor).row()
+
+    def on_preview_scrolled(self, value):
+        """Schedule a lazy re-highlight after the preview is scrolled"""
+        if self._restoring_scroll:
+            return
+
+        # Restarting the timer coalesces rapid scroll events into one render
+        self._rehighlight_timer.start()
+
+    def refresh_visible_highlighting(self):
+        """Re-render the preview, highlighting only the visible window"""
+        if not self._preview_code:
+            return
+
+        # Big-text mode previews stay plain text
+        if len(self._preview_code) > self.BIG_TEXT_THRESHOLD:
+            return
+
+        first_visible, last_visible = self.visible_line_range()
+        html = self.apply_syntax_highlighting(self._preview_code, first_visible, last_visible)
+
+        # Preserve the scroll position across the re-render
+        scrollbar = self.code_preview.verticalScrollBar()
+        scroll_value = scrollbar.value()
+        self._restoring_scroll = True
+        try:
+            self.code_preview.setHtml(html)
+            scrollbar.setValue(scroll_value)
+        finally:
+            self._restoring_scroll = False
     
     def clean_code(self, code: str) -> str:
         """Clean and normalize the code to prevent indentation errors."""
@@ -212,120 +433,68 @@ class OutputPanel(QWidget):
         # Join lines back together
         return '\n'.join(lines)
     
-    def apply_syntax_highlighting(self, code: str) -> str:
+    def apply_syntax_highlighting(self, code: str, first_visible: int = None,
+                                  last_visible: int = None) -> str:
         """
         Apply syntax highlighting to Python code.
-        
+
         Args:
             code: Python code to highlight
-            
+            first_visible: First line to highlight (0-based); lines outside
+                the window are emitted as plain text
+            last_visible: Last line to highlight (0-based)
+
         Returns:
             HTML formatted code with syntax highlighting
         """
         # Simple syntax highlighting using HTML and CSS
         # In a production app, you'd use a more sophisticated highlighting library
-        
-        # Get theme colors
-        theme = settings.get_current_theme()
-        bg_color = theme.get("panel_color", "#ffffff")
-        
-        # Define colors for different syntax elements
-        colors = {
-            'keyword': "#0000FF",  # blue
-            'builtin': "#990000",  # dark red
-            'string': "#008800",   # green
-            'comment': "#888888",  # gray
-            'number': "#FF8800",   # orange
-            'function': "#660066", # purple
-            'class': "#0066BB",    # dark blue
-            'operator': "#666600", # olive
-        }
-        
-        # Simple list of Python keywords for highlighting
-        keywords = [
-            'and', 'as', 'assert', 'break', 'class', 'continue', 'def', 'del', 'elif',
-            'else', 'except', 'finally', 'for', 'from', 'global', 'if', 'import', 'in',
-            'is', 'lambda', 'not', 'or', 'pass', 'raise', 'return', 'try', 'while', 'with', 'yield'
-        ]
-        
-        builtins = [
-            'abs', 'all', 'any', 'bool', 'chr', 'dict', 'dir', 'enumerate', 'eval', 'exec',
-            'filter', 'float', 'format', 'frozenset', 'getattr', 'hasattr', 'hex', 'id',
-            'input', 'int', 'isinstance', 'issubclass', 'len', 'list', 'map', 'max', 'min',
-            'next', 'object', 'open', 'ord', 'pow', 'print', 'property', 'range', 'repr',
-            'reversed', 'round', 'set', 'setattr', 'slice', 'sorted', 'str', 'sum', 'super',
-            'tuple', 'type', 'vars', 'zip'
-        ]
-        
-        # Start with HTML scaffolding
-        html = f"""
-        <html>
-        <head>
-        <style>
-            body {{ background-color: {bg_color}; font-family: monospace; white-space: pre; }}
-            .keyword {{ color: {colors['keyword']}; font-weight: bold; }}
-            .builtin {{ color: {colors['builtin']}; }}
-            .string {{ color: {colors['string']}; }}
-            .comment {{ color: {colors['comment']}; font-style: italic; }}
-            .number {{ color: {colors['number']}; }}
-            .function {{ color: {colors['function']}; }}
-            .class {{ color: {colors['class']}; font-weight: bold; }}
-            .operator {{ color: {colors['operator']}; }}
-            .line-number {{ 
-                color: {colors['comment']}; 
-                display: inline-block;
-                width: 30px;
-                text-align: right;
-                margin-right: 10px;
-                user-select: none;
-                -webkit-user-select: none;
-                border-right: 1px solid {colors['comment']};
-                padding-right: 5px;
-            }}
-        </style>
-        </head>
-        <body>
-        <table border="0" cellspacing="0" cellpadding="0" style="border-collapse: collapse; width: 100%;">
-        """
-        
+
+        # Start with the precomputed HTML scaffolding (rebuilt on theme change)
+        parts = [self._code_css_header]
+
         # Split code into lines for processing
         lines = code.split('\n')
         line_num = 1
-        
+        show_line_numbers = settings.get_app_setting("ui", "show_line_numbers", default=True)
+
         # Process each line
         for line in lines:
-            html += "<tr><td>"
+            parts.append("<tr><td>")
             # Add line number if enabled in settings
-            if settings.get_app_setting("ui", "show_line_numbers", default=True):
-                html += f"<span class='line-number'>{line_num}</span>"
-            
-            html += "</td><td width='100%'>"
-            
-            # Replace special HTML characters
-            line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            
-            # Simple highlighting of keywords
-            for keyword in keywords:
-                line = line.replace(f' {keyword} ', f' <span class="keyword">{keyword}</span> ')
-                line = line.replace(f'{keyword}:', f'<span class="keyword">{keyword}</span>:')
-                line = line.replace(f' {keyword}(', f' <span class="keyword">{keyword}</span>(')
-            
-            # Highlight builtins
-            for builtin in builtins:
-                line = line.replace(f' {builtin}(', f' <span class="builtin">{builtin}</span>(')
+            if show_line_numbers:
+                parts.append(f"<span class='line-number'>{line_num}</span>")
+
+            parts.append("</td><td width='100%'>")
+
+            # Replace special HTML characters (single C call instead of
+            # three chained str.replace passes)
+            line = escape(line, quote=False)
+
+            # Only spend highlighting work on lines inside the visible window
+            in_window = (first_visible is None or
+                         first_visible <= line_num - 1 <= last_visible)
+
+            if in_window:
+                # Split once into identifier/non-identifier segments and
+                # check each token against the frozensets: O(tokens) per
+                # line instead of O(tokens x keywords)
+                tokens = _IDENT_SPLIT.split(line)
+                for i, token in enumerate(tokens):
+                    if token in _KEYWORDS:
+                        tokens[i] = f'<span class="keyword">{token}</span>'
+                    elif token in _BUILTINS:
+                        tokens[i] = f'<span class="builtin">{token}</span>'
+                line = ''.join(tokens)
             
             # Add line to HTML
-            html += line + "</td></tr>\n"
+            parts.append(line + "</td></tr>\n")
             line_num += 1
-        
+
         # Close HTML
-        html += """
-        </table>
-        </body>
-        </html>
-        """
-        
-        return html
+        parts.append(_CODE_HTML_TAIL)
+
+        return ''.join(parts)
     
     def set_execution_output(self, output: str):
         """
@@ -334,7 +503,16 @@ class OutputPanel(QWidget):
         Args:
             output: Text output from code execution
         """
-        self.execution_output.setText(output)
+        # Suppress repaints and signals while pushing in the (potentially
+        # large) output text, then repaint once
+        self.execution_output.setUpdatesEnabled(False)
+        self.execution_output.blockSignals(True)
+        try:
+            self.execution_output.setText(output)
+        finally:
+            self.execution_output.blockSignals(False)
+            self.execution_output.setUpdatesEnabled(True)
+            self.execution_output.viewport().update()
     
     def clear_execution_output(self):
         """Clear the execution output"""
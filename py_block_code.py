@@ -1,1681 +1,1997 @@
-import sys
-import json
-import os
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QFrame, QScrollArea, QLineEdit, QMenu, 
-                             QAction, QToolBar, QSplitter, QTextEdit, QSizePolicy, QComboBox,
-                             QDockWidget, QGroupBox, QFormLayout, QFileDialog, QMessageBox)
-from PyQt5.QtCore import Qt, QMimeData, QPoint, QSize, pyqtSignal, QRect
-from PyQt5.QtGui import QDrag, QColor, QPainter, QPen, QFont, QIcon, QBrush, QLinearGradient
-
-# Load block definitions from JSON
-BLOCK_DEFINITIONS_FILE = "block_definitions.json"
-
-class BlockInputSlot(QFrame):
-    """A slot where other blocks can be inserted as input"""
-    
-    def __init__(self, parent=None, name="", default_text=""):
-        super().__init__(parent)
-        self.name = name
-        self.default_text = default_text
-        self.contained_block = None
-        
-        self.setAcceptDrops(True)
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setMinimumHeight(30)
-        self.setMaximumHeight(40)
-        self.setMinimumWidth(100)
-        
-        self.layout = QHBoxLayout(self)
-        self.layout.setContentsMargins(5, 2, 5, 2)
-        
-        # Use a line edit for text input when no block is inserted
-        self.text_input = QLineEdit(default_text)
-        self.layout.addWidget(self.text_input)
-        
-        # Set styling - improved contrast and visibility
-        self.setStyleSheet("""
-            BlockInputSlot {
-                background-color: rgba(255, 255, 255, 180);
-                border: 1px dashed #666;
-                border-radius: 4px;
-            }
-            BlockInputSlot:hover {
-                border: 2px dashed #444;
-                background-color: rgba(240, 240, 255, 220);
-            }
-            QLineEdit {
-                border: 1px solid #bbb;
-                border-radius: 3px;
-                padding: 2px;
-                background-color: #fdfdfd;
-            }
-        """)
-        
-    def dragEnterEvent(self, event):
-        """Allow dragging blocks into this slot"""
-        if event.mimeData().hasText():
-            event.acceptProposedAction()
-            self.setStyleSheet("""
-                BlockInputSlot {
-                    background-color: rgba(220, 240, 255, 220);
-                    border: 2px dashed #4080C0;
-                    border-radius: 4px;
-                }
-            """)
-            
-    def dragLeaveEvent(self, event):
-        """Reset styling when drag leaves"""
-        self.setStyleSheet("""
-            BlockInputSlot {
-                background-color: rgba(255, 255, 255, 180);
-                border: 1px dashed #666;
-                border-radius: 4px;
-            }
-            BlockInputSlot:hover {
-                border: 2px dashed #444;
-                background-color: rgba(240, 240, 255, 220);
-            }
-            QLineEdit {
-                border: 1px solid #bbb;
-                border-radius: 3px;
-                padding: 2px;
-                background-color: #fdfdfd;
-            }
-        """)
-            
-    def dropEvent(self, event):
-        """Handle dropping a block into this slot"""
-        block_type = event.mimeData().text()
-        
-        # Find main window to get block definitions
-        main_window = self.get_main_window()
-        if not main_window:
-            return
-            
-        # Create a new block in this slot
-        if self.contained_block:
-            self.contained_block.setParent(None)
-            self.contained_block.deleteLater()
-            
-        # Create the new block
-        self.contained_block = CodeBlock(block_type, self, is_nested=True)
-        
-        # Hide the text input and add the block
-        self.text_input.hide()
-        self.layout.addWidget(self.contained_block)
-        
-        # Reset styling
-        self.setStyleSheet("""
-            BlockInputSlot {
-                background-color: rgba(255, 255, 255, 150);
-                border: 1px dashed #888;
-                border-radius: 4px;
-            }
-        """)
-        
-        event.acceptProposedAction()
-        
-    def get_main_window(self):
-        """Get reference to the main window"""
-        parent = self.parent()
-        while parent:
-            if isinstance(parent, CodeBlockEditor):
-                return parent
-            parent = parent.parent()
-        return None
-        
-    def get_value(self):
-        """Get the value of this input slot - either text or generated code from a nested block"""
-        if self.contained_block:
-            # Generate code from the contained block
-            return self.contained_block.generate_code(include_indent=False)
-        else:
-            # Return the text value, handle string formatting
-            value = self.text_input.text()
-            
-            # If this is a prompt or message, automatically add quotes if they're not there
-            # and the text looks like a string (no variables or expressions)
-            if (self.name in ["message", "prompt", "text"] and 
-                not (value.startswith('"') and value.endswith('"')) and
-                not (value.startswith("'") and value.endswith("'")) and
-                not "{" in value and not "+" in value):
-                return f'"{value}"'
-            return value
-        
-    def clear(self):
-        """Clear the slot"""
-        if self.contained_block:
-            self.contained_block.setParent(None)
-            self.contained_block.deleteLater()
-            self.contained_block = None
-            
-        self.text_input.setText(self.default_text)
-        self.text_input.show()
-        
-    def to_json(self):
-        """Serialize the slot to JSON"""
-        if self.contained_block:
-            return {
-                "type": "block",
-                "block": self.contained_block.to_json()
-            }
-        else:
-            return {
-                "type": "text",
-                "value": self.text_input.text()
-            }
-            
-    def from_json(self, data, main_window):
-        """Deserialize the slot from JSON"""
-        if data.get("type") == "block" and "block" in data:
-            block_type = data["block"].get("type")
-            if block_type:
-                self.contained_block = CodeBlock(block_type, self, is_nested=True)
-                self.text_input.hide()
-                self.layout.addWidget(self.contained_block)
-                self.contained_block.from_json(data["block"], main_window)
-        else:
-            self.text_input.setText(data.get("value", self.default_text))
-            self.text_input.show()
-
-class CodeBlockEditor(QMainWindow):
-    """Main window for the Python Block Code editor"""
-    
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Python Block Code Editor")
-        self.setGeometry(100, 100, 1200, 800)
-        
-        # Set application style - improved with better contrast and readability
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f0f0f0;
-            }
-            QToolBar {
-                background-color: #2c3e50;
-                border: none;
-                color: white;
-                spacing: 5px;
-                padding: 3px;
-                font-weight: bold;
-            }
-            QToolBar QToolButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 3px;
-                padding: 6px;
-                margin: 2px;
-                font-size: 14px;
-            }
-            QToolBar QToolButton:hover {
-                background-color: #2980b9;
-            }
-            QToolBar QToolButton:pressed {
-                background-color: #1c6ea4;
-            }
-            QScrollArea {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                background-color: #f8f8f8;
-            }
-            QGroupBox {
-                border: 1px solid #ccc;
-                border-radius: 6px;
-                margin-top: 12px;
-                font-weight: bold;
-                background-color: #f9f9f9;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #333;
-            }
-            QLabel {
-                color: #333;
-            }
-            QSplitter::handle {
-                background-color: #ccc;
-            }
-            QSplitter::handle:horizontal {
-                width: 4px;
-            }
-            QSplitter::handle:vertical {
-                height: 4px;
-            }
-        """)
-        
-        # Main widget and layout
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        self.main_layout = QHBoxLayout(self.central_widget)
-        
-        # Create splitter for resizable panels
-        self.splitter = QSplitter(Qt.Horizontal)
-        self.main_layout.addWidget(self.splitter)
-        
-        # Block palette panel
-        self.setup_block_palette()
-        
-        # Workspace panel
-        self.setup_workspace()
-        
-        # Output panel
-        self.setup_output_panel()
-        
-        # Setup toolbar
-        self.setup_toolbar()
-        
-        # Initialize block types
-        self.initialize_block_types()
-        
-    def setup_block_palette(self):
-        """Set up the panel containing block categories and blocks"""
-        self.palette_widget = QWidget()
-        self.palette_layout = QVBoxLayout(self.palette_widget)
-        self.palette_widget.setStyleSheet("""
-            QWidget {
-                background-color: #f0f2f5;
-            }
-        """)
-        
-        # Title for palette
-        palette_title = QLabel("Block Palette")
-        palette_title.setStyleSheet("""
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            padding: 8px;
-            border-bottom: 1px solid #ddd;
-            margin-bottom: 8px;
-        """)
-        self.palette_layout.addWidget(palette_title)
-        
-        # Block categories
-        self.categories = {
-            "Basic": ["Print", "Variable", "Input", "Comment", "DirectCode"],
-            "Values": ["Value", "StringValue", "NumberValue", "BooleanValue", "ListValue", "DictValue"],
-            "Math": ["Add", "Subtract", "Multiply", "Divide", "Modulo", "Power"],
-            "Logic": ["Compare", "And", "Or", "Not", "If", "IfElse", "While", "For"],
-            "Functions": ["Define Function", "Call Function", "Return"],
-            "Data": ["List Get", "List Set", "List Append", "Dict Get", "Dict Set"]
-        }
-        
-        # Category colors
-        self.category_colors = {
-            "Basic": "#3498db",
-            "Values": "#f39c12",
-            "Math": "#e74c3c",
-            "Logic": "#9b59b6",
-            "Functions": "#2ecc71",
-            "Data": "#1abc9c"
-        }
-        
-        for category, blocks in self.categories.items():
-            group = QGroupBox(category)
-            group.setStyleSheet(f"""
-                QGroupBox {{
-                    border: 1px solid {self.category_colors[category]};
-                    border-radius: 6px;
-                    margin-top: 12px;
-                    font-weight: bold;
-                    color: {self.category_colors[category]};
-                    background-color: rgba({self.hex_to_rgba(self.category_colors[category], 0.05)});
-                }}
-                QGroupBox::title {{
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 5px 0 5px;
-                }}
-            """)
-            group_layout = QVBoxLayout()
-            group_layout.setSpacing(4)
-            
-            for block_type in blocks:
-                block = BlockPaletteItem(block_type, self.category_colors[category])
-                group_layout.addWidget(block)
-            
-            group.setLayout(group_layout)
-            self.palette_layout.addWidget(group)
-        
-        # Add stretch to push blocks to the top
-        self.palette_layout.addStretch(1)
-        
-        # Create scroll area for palette
-        palette_scroll = QScrollArea()
-        palette_scroll.setWidgetResizable(True)
-        palette_scroll.setWidget(self.palette_widget)
-        
-        self.splitter.addWidget(palette_scroll)
-        
-    def hex_to_rgba(self, hex_color, alpha=1.0):
-        """Convert hex color to rgba string"""
-        hex_color = hex_color.lstrip('#')
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return f"{r}, {g}, {b}, {alpha}"
-        
-    def setup_workspace(self):
-        """Set up the main workspace where blocks will be arranged"""
-        self.workspace = WorkspaceWidget()
-        # Add faint grid pattern to workspace
-        self.workspace.setStyleSheet("""
-            WorkspaceWidget {
-                background-color: white;
-                background-image: url('data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACgAAAAoAQMAAAC2MCouAAAABlBMVEXs7Oz////p38LwAAAAE0lEQVQI12P4DwUMo4xhxRjMAQAJMAF5dXMM2wAAAABJRU5ErkJggg==');
-                background-repeat: repeat;
-            }
-        """)
-        
-        # Create a container for the workspace with a title
-        workspace_container = QWidget()
-        workspace_layout = QVBoxLayout(workspace_container)
-        
-        # Title for workspace
-        workspace_title = QLabel("Workspace")
-        workspace_title.setStyleSheet("""
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            padding: 8px;
-            border-bottom: 1px solid #ddd;
-            margin-bottom: 8px;
-        """)
-        workspace_layout.addWidget(workspace_title)
-        
-        # Create scroll area for workspace
-        workspace_scroll = QScrollArea()
-        workspace_scroll.setWidgetResizable(True)
-        workspace_scroll.setWidget(self.workspace)
-        workspace_layout.addWidget(workspace_scroll)
-        
-        self.splitter.addWidget(workspace_container)
-        
-    def setup_output_panel(self):
-        """Set up the output panel for code preview and execution results"""
-        self.output_widget = QWidget()
-        self.output_layout = QVBoxLayout(self.output_widget)
-        self.output_widget.setStyleSheet("""
-            QWidget {
-                background-color: #f0f2f5;
-            }
-            QTextEdit {
-                background-color: white;
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                font-family: Consolas, Monaco, monospace;
-                font-size: 13px;
-                line-height: 1.4;
-                padding: 5px;
-            }
-        """)
-        
-        # Title for output
-        output_title = QLabel("Output")
-        output_title.setStyleSheet("""
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            padding: 8px;
-            border-bottom: 1px solid #ddd;
-            margin-bottom: 8px;
-        """)
-        self.output_layout.addWidget(output_title)
-        
-        # Code preview
-        self.code_preview_label = QLabel("Python Code:")
-        self.code_preview_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-top: 5px;")
-        self.output_layout.addWidget(self.code_preview_label)
-        
-        self.code_preview = QTextEdit()
-        self.code_preview.setReadOnly(True)
-        # Add syntax highlighting
-        self.code_preview.setStyleSheet("""
-            QTextEdit {
-                background-color: #282c34;
-                color: #abb2bf;
-                border: 1px solid #181a1f;
-                border-radius: 4px;
-                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-                font-size: 13px;
-                line-height: 1.5;
-                padding: 8px;
-            }
-        """)
-        self.output_layout.addWidget(self.code_preview)
-        
-        # Execution output
-        self.execution_label = QLabel("Execution Output:")
-        self.execution_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-top: 10px;")
-        self.output_layout.addWidget(self.execution_label)
-        
-        self.execution_output = QTextEdit()
-        self.execution_output.setReadOnly(True)
-        self.execution_output.setStyleSheet("""
-            QTextEdit {
-                background-color: #282c34;
-                color: #98c379;
-                border: 1px solid #181a1f;
-                border-radius: 4px;
-                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-                font-size: 13px;
-                line-height: 1.5;
-                padding: 8px;
-            }
-        """)
-        self.output_layout.addWidget(self.execution_output)
-        
-        # Add to splitter
-        self.splitter.setSizes([250, 600, 350])
-        
-    def setup_toolbar(self):
-        """Set up the application toolbar"""
-        toolbar = QToolBar("Main Toolbar")
-        toolbar.setIconSize(QSize(24, 24))
-        toolbar.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
-        self.addToolBar(toolbar)
-        
-        # Run button
-        run_action = QAction("▶ Run", self)
-        run_action.setStatusTip("Execute the generated Python code")
-        run_action.triggered.connect(self.run_code)
-        toolbar.addAction(run_action)
-        
-        toolbar.addSeparator()
-        
-        # Save button
-        save_action = QAction("💾 Save", self)
-        save_action.setStatusTip("Save current project")
-        save_action.triggered.connect(self.save_project)
-        toolbar.addAction(save_action)
-        
-        # Load button
-        load_action = QAction("📂 Load", self)
-        load_action.setStatusTip("Load a project")
-        load_action.triggered.connect(self.load_project)
-        toolbar.addAction(load_action)
-        
-        toolbar.addSeparator()
-        
-        # Clear workspace button
-        clear_action = QAction("🗑 Clear", self)
-        clear_action.setStatusTip("Clear the workspace")
-        clear_action.triggered.connect(self.clear_workspace)
-        toolbar.addAction(clear_action)
-        
-        # Add an about button
-        toolbar.addSeparator()
-        about_action = QAction("ℹ️ About", self)
-        about_action.setStatusTip("About this application")
-        about_action.triggered.connect(self.show_about)
-        toolbar.addAction(about_action)
-        
-        # Add status bar
-        self.statusBar().showMessage("Ready")
-        
-    def show_about(self):
-        """Show about dialog"""
-        QMessageBox.about(self, "About Python Block Code Editor", 
-                         """<h2>Python Block Code Editor</h2>
-                         <p>A visual programming environment for Python that allows 
-                         you to create Python programs by dragging and dropping code blocks, 
-                         similar to Sketchware/Kodular for Java.</p>
-                         <p>Features include:</p>
-                         <ul>
-                         <li>Nestable blocks</li>
-                         <li>Direct code insertion</li>
-                         <li>Real-time code preview</li>
-                         <li>JSON-based block definitions</li>
-                         </ul>
-                         <p><small>Version 1.0.0</small></p>""")
-        
-    def initialize_block_types(self):
-        """Initialize the block type definitions"""
-        self.block_definitions = {
-            # Basic blocks
-            "Print": {
-                "color": QColor(100, 180, 255),
-                "inputs": [{"name": "message", "type": "slot", "default": "Hello World"}],
-                "code_template": "print({message})"
-            },
-            "Variable": {
-                "color": QColor(255, 180, 100),
-                "inputs": [
-                    {"name": "name", "type": "text", "default": "my_var"},
-                    {"name": "value", "type": "slot", "default": "0"}
-                ],
-                "code_template": "{name} = {value}",
-                "output_enabled": True,
-                "output_value": "{name}"
-            },
-            "Input": {
-                "color": QColor(180, 255, 100),
-                "inputs": [
-                    {"name": "variable", "type": "text", "default": "user_input"},
-                    {"name": "prompt", "type": "slot", "default": "Enter something:"}
-                ],
-                "code_template": "{variable} = input({prompt})"
-            },
-            "Comment": {
-                "color": QColor(150, 150, 150),
-                "inputs": [
-                    {"name": "text", "type": "text", "default": "Add your comment here"}
-                ],
-                "code_template": "# {text}"
-            },
-            "DirectCode": {
-                "color": QColor(150, 150, 150),
-                "inputs": [
-                    {"name": "code", "type": "text", "default": "# Write your Python code here"}
-                ],
-                "code_template": "{code}"
-            },
-            
-            # Value blocks
-            "Value": {
-                "color": QColor(255, 200, 100),
-                "inputs": [
-                    {"name": "value", "type": "text", "default": "0"}
-                ],
-                "output_enabled": True,
-                "output_value": "{value}"
-            },
-            "StringValue": {
-                "color": QColor(100, 220, 255),
-                "inputs": [
-                    {"name": "text", "type": "text", "default": "text"}
-                ],
-                "output_enabled": True,
-                "output_value": "\"{text}\""
-            },
-            "NumberValue": {
-                "color": QColor(255, 220, 100),
-                "inputs": [
-                    {"name": "number", "type": "text", "default": "0"}
-                ],
-                "output_enabled": True,
-                "output_value": "{number}"
-            },
-            "BooleanValue": {
-                "color": QColor(180, 150, 255),
-                "inputs": [
-                    {"name": "value", "type": "choice", "options": ["True", "False"], "default": "True"}
-                ],
-                "output_enabled": True,
-                "output_value": "{value}"
-            },
-            "ListValue": {
-                "color": QColor(100, 200, 180),
-                "inputs": [
-                    {"name": "items", "type": "text", "default": "1, 2, 3"}
-                ],
-                "output_enabled": True,
-                "output_value": "[{items}]"
-            },
-            "DictValue": {
-                "color": QColor(180, 200, 100),
-                "inputs": [
-                    {"name": "items", "type": "text", "default": "'key1': 'value1', 'key2': 'value2'"}
-                ],
-                "output_enabled": True,
-                "output_value": "{{{items}}}"
-            },
-            
-            # Math blocks
-            "Add": {
-                "color": QColor(255, 100, 100),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "0"},
-                    {"name": "b", "type": "slot", "default": "0"},
-                    {"name": "result", "type": "text", "default": "result"}
-                ],
-                "code_template": "{result} = {a} + {b}",
-                "output_enabled": True,
-                "output_value": "({a} + {b})"
-            },
-            "Subtract": {
-                "color": QColor(255, 120, 120),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "0"},
-                    {"name": "b", "type": "slot", "default": "0"},
-                    {"name": "result", "type": "text", "default": "result"}
-                ],
-                "code_template": "{result} = {a} - {b}",
-                "output_enabled": True,
-                "output_value": "({a} - {b})"
-            },
-            "Multiply": {
-                "color": QColor(255, 140, 140),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "0"},
-                    {"name": "b", "type": "slot", "default": "0"},
-                    {"name": "result", "type": "text", "default": "result"}
-                ],
-                "code_template": "{result} = {a} * {b}",
-                "output_enabled": True,
-                "output_value": "({a} * {b})"
-            },
-            "Divide": {
-                "color": QColor(255, 160, 160),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "0"},
-                    {"name": "b", "type": "slot", "default": "1"},
-                    {"name": "result", "type": "text", "default": "result"}
-                ],
-                "code_template": "{result} = {a} / {b}",
-                "output_enabled": True,
-                "output_value": "({a} / {b})"
-            },
-            "Modulo": {
-                "color": QColor(255, 180, 180),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "0"},
-                    {"name": "b", "type": "slot", "default": "1"},
-                    {"name": "result", "type": "text", "default": "result"}
-                ],
-                "code_template": "{result} = {a} % {b}",
-                "output_enabled": True,
-                "output_value": "({a} % {b})"
-            },
-            "Power": {
-                "color": QColor(255, 200, 200),
-                "inputs": [
-                    {"name": "base", "type": "slot", "default": "2"},
-                    {"name": "exponent", "type": "slot", "default": "2"},
-                    {"name": "result", "type": "text", "default": "result"}
-                ],
-                "code_template": "{result} = {base} ** {exponent}",
-                "output_enabled": True,
-                "output_value": "({base} ** {exponent})"
-            },
-            
-            # Logic blocks
-            "Compare": {
-                "color": QColor(180, 150, 255),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "0"},
-                    {"name": "operator", "type": "choice", "options": ["==", "!=", ">", "<", ">=", "<="], "default": "=="},
-                    {"name": "b", "type": "slot", "default": "0"}
-                ],
-                "output_enabled": True,
-                "output_value": "({a} {operator} {b})"
-            },
-            "And": {
-                "color": QColor(170, 140, 230),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "True"},
-                    {"name": "b", "type": "slot", "default": "True"}
-                ],
-                "output_enabled": True,
-                "output_value": "({a} and {b})"
-            },
-            "Or": {
-                "color": QColor(190, 160, 240),
-                "inputs": [
-                    {"name": "a", "type": "slot", "default": "True"},
-                    {"name": "b", "type": "slot", "default": "True"}
-                ],
-                "output_enabled": True,
-                "output_value": "({a} or {b})"
-            },
-            "Not": {
-                "color": QColor(200, 170, 250),
-                "inputs": [
-                    {"name": "condition", "type": "slot", "default": "True"}
-                ],
-                "output_enabled": True,
-                "output_value": "(not {condition})"
-            },
-            "If": {
-                "color": QColor(200, 100, 255),
-                "inputs": [{"name": "condition", "type": "slot", "default": "True"}],
-                "code_template": "if {condition}:",
-                "has_children": True
-            },
-            "IfElse": {
-                "color": QColor(180, 100, 200),
-                "inputs": [{"name": "condition", "type": "slot", "default": "True"}],
-                "code_template": "if {condition}:",
-                "else_template": "else:",
-                "has_children": True,
-                "has_else_children": True
-            },
-            "While": {
-                "color": QColor(100, 255, 200),
-                "inputs": [{"name": "condition", "type": "slot", "default": "True"}],
-                "code_template": "while {condition}:",
-                "has_children": True
-            },
-            "For": {
-                "color": QColor(100, 200, 255),
-                "inputs": [
-                    {"name": "variable", "type": "text", "default": "i"},
-                    {"name": "iterable", "type": "slot", "default": "range(10)"}
-                ],
-                "code_template": "for {variable} in {iterable}:",
-                "has_children": True
-            },
-            
-            # Function blocks
-            "Define Function": {
-                "color": QColor(100, 200, 150),
-                "inputs": [
-                    {"name": "name", "type": "text", "default": "my_function"},
-                    {"name": "params", "type": "text", "default": ""}
-                ],
-                "code_template": "def {name}({params}):",
-                "has_children": True
-            },
-            "Call Function": {
-                "color": QColor(120, 220, 170),
-                "inputs": [
-                    {"name": "name", "type": "text", "default": "my_function"},
-                    {"name": "args", "type": "text", "default": ""}
-                ],
-                "code_template": "{name}({args})",
-                "output_enabled": True,
-                "output_value": "{name}({args})"
-            },
-            "Return": {
-                "color": QColor(140, 240, 190),
-                "inputs": [
-                    {"name": "value", "type": "slot", "default": ""}
-                ],
-                "code_template": "return {value}"
-            },
-            
-            # Data structure blocks
-            "List Get": {
-                "color": QColor(100, 180, 200),
-                "inputs": [
-                    {"name": "list", "type": "slot", "default": "my_list"},
-                    {"name": "index", "type": "slot", "default": "0"}
-                ],
-                "output_enabled": True,
-                "output_value": "{list}[{index}]"
-            },
-            "List Set": {
-                "color": QColor(120, 200, 220),
-                "inputs": [
-                    {"name": "list", "type": "slot", "default": "my_list"},
-                    {"name": "index", "type": "slot", "default": "0"},
-                    {"name": "value", "type": "slot", "default": "new_value"}
-                ],
-                "code_template": "{list}[{index}] = {value}"
-            },
-            "List Append": {
-                "color": QColor(140, 220, 240),
-                "inputs": [
-                    {"name": "list", "type": "slot", "default": "my_list"},
-                    {"name": "value", "type": "slot", "default": "new_item"}
-                ],
-                "code_template": "{list}.append({value})"
-            },
-            "Dict Get": {
-                "color": QColor(180, 200, 100),
-                "inputs": [
-                    {"name": "dict", "type": "slot", "default": "my_dict"},
-                    {"name": "key", "type": "slot", "default": "'key'"}
-                ],
-                "output_enabled": True,
-                "output_value": "{dict}[{key}]"
-            },
-            "Dict Set": {
-                "color": QColor(200, 220, 120),
-                "inputs": [
-                    {"name": "dict", "type": "slot", "default": "my_dict"},
-                    {"name": "key", "type": "slot", "default": "'key'"},
-                    {"name": "value", "type": "slot", "default": "new_value"}
-                ],
-                "code_template": "{dict}[{key}] = {value}"
-            }
-        }
-        
-        # Try to load block definitions from JSON if available
-        try:
-            if os.path.exists(BLOCK_DEFINITIONS_FILE):
-                with open(BLOCK_DEFINITIONS_FILE, 'r') as f:
-                    json_defs = json.load(f)
-                    
-                # Process JSON definitions
-                for block_type, def_data in json_defs.items():
-                    if "color" in def_data:
-                        color_data = def_data["color"]
-                        if isinstance(color_data, list) and len(color_data) >= 3:
-                            def_data["color"] = QColor(*color_data)
-                            
-                    self.block_definitions[block_type] = def_data
-        except Exception as e:
-            print(f"Error loading block definitions: {e}")
-        
-    def generate_code(self):
-        """Generate Python code from blocks in the workspace"""
-        code = self.workspace.generate_code()
-        
-        # Apply syntax highlighting through CSS (simplified method)
-        # In a real implementation, you would use a proper Python syntax highlighter
-        highlighted_code = ""
-        for line in code.split('\n'):
-            line = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            if line.strip().startswith('def ') or line.strip().startswith('class '):
-                highlighted_code += f'<span style="color: #61afef;">{line}</span><br>'
-            elif line.strip().startswith('if ') or line.strip().startswith('else') or line.strip().startswith('for ') or line.strip().startswith('while '):
-                highlighted_code += f'<span style="color: #c678dd;">{line}</span><br>'
-            elif line.strip().startswith('return '):
-                highlighted_code += f'<span style="color: #e06c75;">{line}</span><br>'
-            elif line.strip().startswith('#'):
-                highlighted_code += f'<span style="color: #98c379;">{line}</span><br>'
-            elif "=" in line and not "==" in line:
-                highlighted_code += f'<span style="color: #d19a66;">{line}</span><br>'
-            else:
-                highlighted_code += f'{line}<br>'
-                
-        self.code_preview.setHtml(highlighted_code)
-        return code
-        
-    def run_code(self):
-        """Run the generated Python code"""
-        code = self.generate_code()
-        self.execution_output.clear()
-        
-        try:
-            # Redirect stdout to capture print output
-            import io
-            import sys
-            from contextlib import redirect_stdout
-            
-            output = io.StringIO()
-            with redirect_stdout(output):
-                exec(code)
-                
-            self.execution_output.setText(output.getvalue())
-        except Exception as e:
-            self.execution_output.setText(f"Error: {str(e)}")
-            
-    def save_project(self):
-        """Save the current project to a file"""
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Save Project", "", "Python Block Code Project (*.pbc);;All Files (*)")
-        
-        if not filename:
-            return
-        
-        # Add extension if it doesn't have one
-        if not filename.endswith('.pbc'):
-            filename += '.pbc'
-        
-        try:
-            # Create project data
-            project_data = self.workspace.to_json()
-            
-            # Write to file
-            with open(filename, 'w') as f:
-                json.dump(project_data, f, indent=2)
-                
-            QMessageBox.information(self, "Save Successful", f"Project saved successfully to {filename}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Save Error", f"An error occurred while saving: {str(e)}")
-        
-    def load_project(self):
-        """Load a project from a file"""
-        filename, _ = QFileDialog.getOpenFileName(
-            self, "Load Project", "", "Python Block Code Project (*.pbc);;All Files (*)")
-        
-        if not filename:
-            return
-        
-        try:
-            # Load project data
-            with open(filename, 'r') as f:
-                project_data = json.load(f)
-                
-            # Apply to workspace
-            self.workspace.from_json(project_data, self)
-            
-            # Update code preview
-            self.generate_code()
-            
-            QMessageBox.information(self, "Load Successful", f"Project loaded successfully from {filename}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Load Error", f"An error occurred while loading: {str(e)}")
-        
-    def clear_workspace(self):
-        """Clear all blocks from the workspace"""
-        self.workspace.clear()
-        
-
-class BlockPaletteItem(QFrame):
-    """Represents a block in the palette that can be dragged to the workspace"""
-    
-    def __init__(self, block_type, color="#3498db"):
-        super().__init__()
-        self.block_type = block_type
-        self.color = color
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setLineWidth(1)
-        self.setMinimumHeight(40)
-        self.setMaximumHeight(40)
-        
-        # Set rounded corners and gradient background - improved visuals
-        self.setStyleSheet(f"""
-            BlockPaletteItem {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                        stop:0 {color}, stop:1 {self.darker_color(color)});
-                color: white;
-                border-radius: 6px;
-                border: 1px solid {self.darker_color(color)};
-            }}
-            BlockPaletteItem:hover {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                        stop:0 {self.lighter_color(color)}, stop:1 {color});
-                border: 1px solid {self.darker_color(self.darker_color(color))};
-            }}
-        """)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 4, 10, 4)
-        
-        # Add an icon or indicator
-        icon_label = QLabel("◆")
-        icon_label.setMaximumWidth(20)
-        icon_label.setStyleSheet("color: rgba(255, 255, 255, 0.7); background: transparent; border: none;")
-        layout.addWidget(icon_label)
-        
-        # Add the main text label
-        label = QLabel(block_type)
-        label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        label.setStyleSheet("color: white; font-weight: bold; background: transparent; border: none;")
-        layout.addWidget(label)
-        
-        # Make cursor indicate draggability
-        self.setCursor(Qt.OpenHandCursor)
-        
-    def darker_color(self, color):
-        """Return a darker version of the color"""
-        qcolor = QColor(color)
-        h, s, v, a = qcolor.getHsv()
-        qcolor.setHsv(h, s, max(0, v - 30), a)
-        return qcolor.name()
-        
-    def lighter_color(self, color):
-        """Return a lighter version of the color"""
-        qcolor = QColor(color)
-        h, s, v, a = qcolor.getHsv()
-        qcolor.setHsv(h, min(255, s - 10 if s > 10 else s), min(255, v + 30), a)
-        return qcolor.name()
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.drag_start_position = event.pos()
-            self.setCursor(Qt.ClosedHandCursor)  # Change cursor on click
-
-    def mouseReleaseEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.setCursor(Qt.OpenHandCursor)  # Restore cursor
-            
-    def mouseMoveEvent(self, event):
-        if not (event.buttons() & Qt.LeftButton):
-            return
-            
-        if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
-            return
-            
-        drag = QDrag(self)
-        mime_data = QMimeData()
-        mime_data.setText(self.block_type)
-        drag.setMimeData(mime_data)
-        
-        # Create a nice looking drag pixmap with shadow effect
-        pixmap = self.grab()
-        drag.setPixmap(pixmap)
-        drag.setHotSpot(event.pos())
-        
-        # Show feedback to user
-        self.setStyleSheet(f"""
-            BlockPaletteItem {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                        stop:0 {self.color}, stop:1 {self.darker_color(self.color)});
-                color: white;
-                border-radius: 6px;
-                border: 1px solid {self.darker_color(self.color)};
-                opacity: 0.7;
-            }}
-        """)
-        
-        result = drag.exec_(Qt.CopyAction)
-        
-        # Restore normal appearance
-        self.setStyleSheet(f"""
-            BlockPaletteItem {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                        stop:0 {self.color}, stop:1 {self.darker_color(self.color)});
-                color: white;
-                border-radius: 6px;
-                border: 1px solid {self.darker_color(self.color)};
-            }}
-            BlockPaletteItem:hover {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                        stop:0 {self.lighter_color(self.color)}, stop:1 {self.color});
-                border: 1px solid {self.darker_color(self.darker_color(self.color))};
-            }}
-        """)
-        self.setCursor(Qt.OpenHandCursor)  # Restore cursor
-
-
-class CodeBlock(QFrame):
-    """Represents a code block in the workspace"""
-    
-    def __init__(self, block_type, parent=None, is_nested=False):
-        super().__init__(parent)
-        self.block_type = block_type
-        self.input_widgets = {}
-        self.input_slots = {}
-        self.child_blocks = []
-        self.else_blocks = []
-        self.is_nested = is_nested  # Whether this block is nested in an input slot
-        
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setLineWidth(2)
-        
-        if is_nested:
-            self.setMinimumHeight(30)
-            self.setMaximumHeight(40)
-        else:
-            self.setMinimumHeight(50)
-            
-        self.setMinimumWidth(200)
-        
-        # Get block definition from parent window
-        main_window = self.get_main_window()
-        if main_window and block_type in main_window.block_definitions:
-            self.definition = main_window.block_definitions[block_type]
-            bg_color = self.definition.get("color", QColor(200, 200, 200))
-            
-            # Create a gradient effect for the block - improved with better contrast
-            gradient_color = self.lighter_color(bg_color.name())
-            dark_border = self.darker_color(bg_color.name())
-            
-            # Set base style
-            base_style = f"""
-                CodeBlock {{
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                                            stop:0 {gradient_color}, stop:1 {bg_color.name()});
-                    border-radius: 8px;
-                    border: 2px solid {dark_border};
-                }}
-                QLabel {{
-                    color: black;
-                    background: transparent;
-                    border: none;
-                }}
-                QLineEdit {{
-                    border: 1px solid #bbb;
-                    border-radius: 4px;
-                    padding: 3px;
-                    background: white;
-                    selection-background-color: {bg_color.name()};
-                }}
-                QLineEdit:focus {{
-                    border: 1px solid {bg_color.name()};
-                    background: #fafafa;
-                }}
-                QPushButton {{
-                    background: #e74c3c;
-                    color: white;
-                    border-radius: 10px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background: #c0392b;
-                }}
-            """
-            
-            # Add shadow or hover effects for non-nested blocks
-            if not is_nested:
-                base_style += f"""
-                    CodeBlock:hover {{
-                        border: 2px solid {self.darker_color(dark_border)};
-                    }}
-                """
-                
-            self.setStyleSheet(base_style)
-        else:
-            self.definition = {
-                "inputs": [],
-                "code_template": f"# {block_type}",
-                "has_children": False
-            }
-            self.setStyleSheet("""
-                CodeBlock {
-                    background: #e0e0e0;
-                    border-radius: 8px;
-                    border: 2px solid #aaaaaa;
-                }
-                CodeBlock:hover {
-                    border: 2px solid #888888;
-                }
-            """)
-        
-        # Create layout
-        self.layout = QVBoxLayout(self)
-        self.layout.setSpacing(5)
-        self.layout.setContentsMargins(10, 5, 10, 5)
-        
-        # Header with block type
-        header_layout = QHBoxLayout()
-        
-        # Add a small indicator icon for the block type
-        if not is_nested:
-            icon_label = QLabel("◆")
-            icon_label.setMaximumWidth(20)
-            icon_label.setStyleSheet("color: rgba(0, 0, 0, 0.4); font-size: 12px;")
-            header_layout.addWidget(icon_label)
-        
-        # Add the block title
-        header_label = QLabel(block_type)
-        if is_nested:
-            header_label.setStyleSheet("font-weight: bold; font-size: 12px;")
-        else:
-            header_label.setStyleSheet("font-weight: bold; font-size: 14px;")
-        header_layout.addWidget(header_label)
-        
-        # Add spacer
-        header_layout.addStretch(1)
-        
-        # Don't add delete button for nested blocks
-        if not is_nested:
-            # Add delete button
-            delete_button = QPushButton("×")
-            delete_button.setMaximumWidth(20)
-            delete_button.setMaximumHeight(20)
-            delete_button.setToolTip("Delete this block")
-            delete_button.clicked.connect(self.remove_block)
-            header_layout.addWidget(delete_button)
-        
-        self.layout.addLayout(header_layout)
-        
-        # Add input fields based on block definition
-        self.setup_inputs()
-        
-        # For nested blocks, we reduce the size and simplify the UI
-        if is_nested:
-            self.setFrameShape(QFrame.NoFrame)
-            self.layout.setContentsMargins(0, 0, 0, 0)
-            self.layout.setSpacing(2)
-            
-        # If block can have children, add container for them
-        if self.definition.get("has_children", False) and not is_nested:
-            self.setup_child_container()
-            
-            # Also setup else container if needed
-            if self.definition.get("has_else_children", False):
-                self.setup_else_container()
-        
-        # Make block draggable unless it's nested
-        if not is_nested:
-            self.setMouseTracking(True)
-            self.dragging = False
-            self.drag_start_position = None
-            self.setCursor(Qt.OpenHandCursor)  # Set cursor to indicate draggability
-            
-    def setup_child_container(self):
-        """Setup container for child blocks"""
-        self.child_container = QWidget(self)
-        self.child_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 120);
-            border-radius: 6px;
-            border: 1px dashed rgba(0, 0, 0, 0.2);
-        """)
-        self.child_layout = QVBoxLayout(self.child_container)
-        self.child_layout.setContentsMargins(20, 5, 5, 5)
-        self.layout.addWidget(self.child_container)
-        
-        # Add a placeholder for dropping blocks
-        self.drop_placeholder = QLabel("Drop blocks here")
-        self.drop_placeholder.setAlignment(Qt.AlignCenter)
-        self.drop_placeholder.setStyleSheet("""
-            background-color: rgba(200, 200, 200, 100);
-            border: 1px dashed gray;
-            border-radius: 4px;
-            color: #555;
-            padding: 10px;
-            margin: 5px;
-        """)
-        self.drop_placeholder.setMinimumHeight(40)
-        self.child_layout.addWidget(self.drop_placeholder)
-        
-        # Make the child container accept drops
-        self.child_container.setAcceptDrops(True)
-        self.child_container.dragEnterEvent = self.child_drag_enter
-        self.child_container.dropEvent = self.child_drop_event
-        
-    def child_drag_enter(self, event):
-        """Handle drag enter on child container"""
-        if event.mimeData().hasText():
-            self.child_container.setStyleSheet("""
-                background: rgba(220, 240, 255, 180);
-                border-radius: 6px;
-                border: 1px dashed rgba(0, 0, 150, 0.3);
-            """)
-            event.acceptProposedAction()
-            
-    def child_drop_event(self, event):
-        """Handle drop on child container"""
-        block_type = event.mimeData().text()
-        
-        # Create a new block
-        new_block = CodeBlock(block_type, self.child_container)
-        self.child_layout.insertWidget(self.child_layout.count() - 1, new_block)  # Insert before placeholder
-        self.child_blocks.append(new_block)
-        
-        # Reset styling
-        self.child_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 120);
-            border-radius: 6px;
-            border: 1px dashed rgba(0, 0, 0, 0.2);
-        """)
-        
-        event.acceptProposedAction()
-        
-    def setup_else_container(self):
-        """Setup container for else blocks"""
-        # Add an 'else' label
-        else_label = QLabel("else:")
-        else_label.setStyleSheet("font-weight: bold; font-size: 14px;")
-        self.layout.addWidget(else_label)
-        
-        self.else_container = QWidget(self)
-        self.else_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 120);
-            border-radius: 6px;
-            border: 1px dashed rgba(0, 0, 0, 0.2);
-        """)
-        self.else_layout = QVBoxLayout(self.else_container)
-        self.else_layout.setContentsMargins(20, 5, 5, 5)
-        self.layout.addWidget(self.else_container)
-        
-        # Add a placeholder for dropping blocks
-        self.else_drop_placeholder = QLabel("Drop 'else' blocks here")
-        self.else_drop_placeholder.setAlignment(Qt.AlignCenter)
-        self.else_drop_placeholder.setStyleSheet("""
-            background-color: rgba(200, 200, 200, 100);
-            border: 1px dashed gray;
-            border-radius: 4px;
-            color: #555;
-            padding: 10px;
-            margin: 5px;
-        """)
-        self.else_drop_placeholder.setMinimumHeight(40)
-        self.else_layout.addWidget(self.else_drop_placeholder)
-        
-        # Make the else container accept drops
-        self.else_container.setAcceptDrops(True)
-        self.else_container.dragEnterEvent = self.else_drag_enter
-        self.else_container.dropEvent = self.else_drop_event
-        
-    def else_drag_enter(self, event):
-        """Handle drag enter on else container"""
-        if event.mimeData().hasText():
-            self.else_container.setStyleSheet("""
-                background: rgba(220, 240, 255, 180);
-                border-radius: 6px;
-                border: 1px dashed rgba(0, 0, 150, 0.3);
-            """)
-            event.acceptProposedAction()
-            
-    def else_drop_event(self, event):
-        """Handle drop on else container"""
-        block_type = event.mimeData().text()
-        
-        # Create a new block
-        new_block = CodeBlock(block_type, self.else_container)
-        self.else_layout.insertWidget(self.else_layout.count() - 1, new_block)  # Insert before placeholder
-        self.else_blocks.append(new_block)
-        
-        # Reset styling
-        self.else_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 120);
-            border-radius: 6px;
-            border: 1px dashed rgba(0, 0, 0, 0.2);
-        """)
-        
-        event.acceptProposedAction()
-    
-    def lighter_color(self, color):
-        """Return a lighter version of the color"""
-        qcolor = QColor(color)
-        h, s, v, a = qcolor.getHsv()
-        qcolor.setHsv(h, max(0, s - 20), min(255, v + 40), a)
-        return qcolor.name()
-        
-    def darker_color(self, color):
-        """Return a darker version of the color"""
-        qcolor = QColor(color)
-        h, s, v, a = qcolor.getHsv()
-        qcolor.setHsv(h, min(255, s + 20), max(0, v - 40), a)
-        return qcolor.name()
-    
-    def setup_inputs(self):
-        """Set up input fields based on block definition"""
-        if "inputs" not in self.definition:
-            return
-            
-        inputs_layout = QFormLayout()
-        inputs_layout.setContentsMargins(5, 0, 5, 0)
-        inputs_layout.setVerticalSpacing(5)
-        inputs_layout.setHorizontalSpacing(10)
-        
-        for input_def in self.definition["inputs"]:
-            name = input_def["name"]
-            input_type = input_def.get("type", "text")
-            default = input_def.get("default", "")
-            
-            if input_type == "text":
-                input_widget = QLineEdit(default)
-                # Add placeholder text
-                input_widget.setPlaceholderText(f"Enter {name}...")
-                self.input_widgets[name] = input_widget
-                inputs_layout.addRow(f"{name}:", input_widget)
-            elif input_type == "choice":
-                input_widget = QComboBox()
-                for option in input_def.get("options", []):
-                    input_widget.addItem(option)
-                if default:
-                    input_widget.setCurrentText(default)
-                self.input_widgets[name] = input_widget
-                inputs_layout.addRow(f"{name}:", input_widget)
-            elif input_type == "slot":
-                # Create a slot that can accept other blocks
-                input_slot = BlockInputSlot(self, name, default)
-                self.input_slots[name] = input_slot
-                inputs_layout.addRow(f"{name}:", input_slot)
-            
-        self.layout.addLayout(inputs_layout)
-        
-    def get_main_window(self):
-        """Get reference to the main window"""
-        parent = self.parent()
-        while parent:
-            if isinstance(parent, CodeBlockEditor):
-                return parent
-            parent = parent.parent()
-        return None
-        
-    def remove_block(self):
-        """Remove this block from the workspace"""
-        # Show confirmation dialog
-        reply = QMessageBox.question(self, "Remove Block", 
-                                    f"Are you sure you want to remove this '{self.block_type}' block?",
-                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        
-        if reply == QMessageBox.No:
-            return
-            
-        # Find if this block is in a workspace
-        workspace = None
-        parent = self.parent()
-        while parent:
-            if isinstance(parent, WorkspaceWidget):
-                workspace = parent
-                break
-            parent = parent.parent()
-            
-        if workspace:
-            workspace.blocks.remove(self)
-            
-        self.setParent(None)
-        self.deleteLater()
-        
-    def generate_code(self, indent_level=0, include_indent=True):
-        """Generate Python code for this block and its children"""
-        indent = "    " * indent_level if include_indent else ""
-        
-        # Replace template variables with values from input widgets and slots
-        code_template = self.definition.get("code_template", f"# {self.block_type}")
-        code = code_template
-        
-        # Process text input widgets
-        for name, widget in self.input_widgets.items():
-            if isinstance(widget, QLineEdit):
-                value = widget.text()
-            elif isinstance(widget, QComboBox):
-                value = widget.currentText()
-            else:
-                value = str(widget)
-                
-            code = code.replace(f"{{{name}}}", value)
-            
-        # Process input slots
-        for name, slot in self.input_slots.items():
-            value = slot.get_value()
-            code = code.replace(f"{{{name}}}", value)
-        
-        # For nested blocks that can output a value, just return the output value
-        if self.is_nested and self.definition.get("output_enabled", False):
-            output_value = self.definition.get("output_value", "")
-            
-            # Substitute any remaining variables in the output value
-            for name, widget in self.input_widgets.items():
-                if isinstance(widget, QLineEdit):
-                    value = widget.text()
-                elif isinstance(widget, QComboBox):
-                    value = widget.currentText()
-                else:
-                    value = str(widget)
-                    
-                output_value = output_value.replace(f"{{{name}}}", value)
-                
-            # Also process slots
-            for name, slot in self.input_slots.items():
-                value = slot.get_value()
-                output_value = output_value.replace(f"{{{name}}}", value)
-                
-            return output_value
-            
-        # For regular blocks, add the code with indentation
-        result = indent + code + "\n"
-        
-        # Add code for child blocks if applicable
-        if self.definition.get("has_children", False) and not self.is_nested:
-            for child in self.child_blocks:
-                result += child.generate_code(indent_level + 1)
-                
-            # Add else section if applicable
-            if self.definition.get("has_else_children", False) and self.definition.get("else_template"):
-                result += indent + self.definition.get("else_template") + "\n"
-                
-                for else_child in self.else_blocks:
-                    result += else_child.generate_code(indent_level + 1)
-                
-        return result
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton and not self.is_nested:
-            self.drag_start_position = event.pos()
-            self.dragging = True
-            self.setCursor(Qt.ClosedHandCursor)  # Change cursor on click
-            
-    def mouseReleaseEvent(self, event):
-        if event.button() == Qt.LeftButton and not self.is_nested:
-            self.dragging = False
-            self.setCursor(Qt.OpenHandCursor)  # Restore cursor
-            
-    def mouseMoveEvent(self, event):
-        if not (event.buttons() & Qt.LeftButton) or not self.dragging or self.is_nested:
-            return
-            
-        # Calculate distance moved
-        if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
-            return
-            
-        # For non-nested blocks, create a drag
-        drag = QDrag(self)
-        mime_data = QMimeData()
-        mime_data.setText(self.block_type)
-        drag.setMimeData(mime_data)
-        
-        # Create a pixmap of the block
-        pixmap = self.grab()
-        drag.setPixmap(pixmap)
-        drag.setHotSpot(event.pos())
-        
-        # Find if this block is in a workspace
-        workspace = None
-        parent = self.parent()
-        while parent:
-            if isinstance(parent, WorkspaceWidget):
-                workspace = parent
-                break
-            parent = parent.parent()
-            
-        if workspace:
-            # Remove this block from the workspace during drag
-            workspace.blocks.remove(self)
-            self.setParent(None)
-            
-        # Execute the drag
-        result = drag.exec_(Qt.MoveAction)
-        
-        # If drag was cancelled, add block back to workspace
-        if result == Qt.IgnoreAction and workspace:
-            self.setParent(workspace)
-            workspace.layout.addWidget(self)
-            workspace.blocks.append(self)
-            self.setCursor(Qt.OpenHandCursor)  # Restore cursor
-
-
-class WorkspaceWidget(QWidget):
-    """Workspace where blocks are arranged"""
-    
-    def __init__(self):
-        super().__init__()
-        self.setAcceptDrops(True)
-        
-        # Use a layout for the workspace
-        self.layout = QVBoxLayout(self)
-        self.layout.setAlignment(Qt.AlignTop)
-        self.layout.setSpacing(10)
-        self.layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Add some instruction text
-        instructions = QLabel("Drag blocks from the palette and drop them here")
-        instructions.setAlignment(Qt.AlignCenter)
-        instructions.setStyleSheet("""
-            color: #777;
-            font-style: italic;
-            font-size: 14px;
-            padding: 20px;
-            background-color: rgba(240, 240, 240, 150);
-            border: 1px dashed #aaa;
-            border-radius: 8px;
-        """)
-        self.layout.addWidget(instructions)
-        
-        self.blocks = []
-        
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasText():
-            # Visual feedback
-            self.setStyleSheet("""
-                WorkspaceWidget {
-                    background-color: white;
-                    background-image: url('data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACgAAAAoAQMAAAC2MCouAAAABlBMVEXs7Oz////p38LwAAAAE0lEQVQI12P4DwUMo4xhxRjMAQAJMAF5dXMM2wAAAABJRU5ErkJggg==');
-                    background-repeat: repeat;
-                    border: 2px dashed #3498db;
-                }
-            """)
-            event.acceptProposedAction()
-            
-    def dragLeaveEvent(self, event):
-        # Reset styling
-        self.setStyleSheet("""
-            WorkspaceWidget {
-                background-color: white;
-                background-image: url('data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACgAAAAoAQMAAAC2MCouAAAABlBMVEXs7Oz////p38LwAAAAE0lEQVQI12P4DwUMo4xhxRjMAQAJMAF5dXMM2wAAAABJRU5ErkJggg==');
-                background-repeat: repeat;
-            }
-        """)
-        
-    def dropEvent(self, event):
-        block_type = event.mimeData().text()
-        
-        # Create a new block
-        block = CodeBlock(block_type, self)
-        self.layout.addWidget(block)
-        self.blocks.append(block)
-        
-        # Reset styling
-        self.setStyleSheet("""
-            WorkspaceWidget {
-                background-color: white;
-                background-image: url('data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACgAAAAoAQMAAAC2MCouAAAABlBMVEXs7Oz////p38LwAAAAE0lEQVQI12P4DwUMo4xhxRjMAQAJMAF5dXMM2wAAAABJRU5ErkJggg==');
-                background-repeat: repeat;
-            }
-        """)
-        
-        event.acceptProposedAction()
-        
-    def clear(self):
-        """Remove all blocks from the workspace"""
-        # Ask for confirmation
-        if self.blocks:
-            reply = QMessageBox.question(self, "Clear Workspace", 
-                                     "Are you sure you want to clear the workspace? All blocks will be deleted.",
-                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-                                     
-            if reply == QMessageBox.No:
-                return
-                
-        for block in self.blocks[:]:
-            block.setParent(None)
-            block.deleteLater()
-        self.blocks.clear()
-        
-    def generate_code(self):
-        """Generate Python code from all blocks in the workspace"""
-        code = "# Generated Python Code\n\n"
-        
-        for block in self.blocks:
-            code += block.generate_code()
-            
-        return code
-        
-    def to_json(self):
-        """Serialize workspace to JSON"""
-        data = {
-            "blocks": []
-        }
-        
-        for block in self.blocks:
-            data["blocks"].append(block.to_json())
-            
-        return data
-        
-    def from_json(self, data, main_window):
-        """Deserialize workspace from JSON"""
-        self.clear()
-        
-        for block_data in data.get("blocks", []):
-            block_type = block_data.get("type", "")
-            if not block_type:
-                continue
-                
-            block = CodeBlock(block_type, self)
-            self.layout.addWidget(block)
-            self.blocks.append(block)
-            block.from_json(block_data, main_window)
-
-
-def main():
-    app = QApplication(sys.argv)
-    window = CodeBlockEditor()
-    window.show()
-    sys.exit(app.exec_())
-
-if __name__ == "__main__":
+import sys
+import json
+import os
+import re
+import time
+import weakref
+from functools import lru_cache
+
+# orjson serializes the nested project dicts considerably faster than
+# stdlib json; fall back silently when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _write_project_json(data, filename):
+    """Write project data to a file as indented JSON"""
+    if orjson is not None:
+        # orjson produces the full output as one bytes allocation; write
+        # it in binary mode to skip the decode/re-encode round trip
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        # json.dump streams straight to the file without building the
+        # whole pretty-printed string in memory
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def _load_project_json(f):
+    """Read project data from an open file"""
+    # Bulk-read then parse; json.load's incremental file reads are slower
+    # than handing the parser one string
+    data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@lru_cache(maxsize=32)
+def _compile_cached(code):
+    """Compile generated code once per distinct source string.
+
+    Re-running unchanged block code skips the parse/compile stage.
+    """
+    return compile(code, "<blocks>", "exec")
+
+@lru_cache(maxsize=4)
+def _load_block_def_overrides(path, mtime):
+    """Load block definition overrides from a JSON file.
+
+    Memoized on (path, mtime) so repeated editor instantiations only
+    re-parse the file after it actually changes.
+    """
+    with open(path, 'r') as f:
+        json_defs = _load_project_json(f)
+
+    # Convert [r, g, b] color lists to QColor once at load time
+    for def_data in json_defs.values():
+        color_data = def_data.get("color")
+        if isinstance(color_data, list) and len(color_data) >= 3:
+            def_data["color"] = QColor(*color_data)
+
+    # Interned keys match the built-in definitions' interned keys
+    return {sys.intern(block_type): def_data
+            for block_type, def_data in json_defs.items()}
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QPushButton, QLabel, QFrame, QScrollArea, QLineEdit,
+                             QAction, QToolBar, QSplitter, QTextEdit, QComboBox,
+                             QGroupBox, QFormLayout, QFileDialog, QMessageBox)
+from PyQt5.QtCore import Qt, QEvent, QMimeData, QRegularExpression, QSize, QTimer
+from PyQt5.QtGui import QDrag, QColor, QSyntaxHighlighter, QTextCharFormat
+
+# Load block definitions from JSON
+BLOCK_DEFINITIONS_FILE = "block_definitions.json"
+
+# Block categories as (name, color, block types) tuples; a flat tuple
+# iterates with direct unpacking and no per-category hash lookups
+CATEGORIES = (
+    ("Basic", "#3498db", ("Print", "Variable", "Input", "Comment", "DirectCode")),
+    ("Values", "#f39c12", ("Value", "StringValue", "NumberValue", "BooleanValue", "ListValue", "DictValue")),
+    ("Math", "#e74c3c", ("Add", "Subtract", "Multiply", "Divide", "Modulo", "Power")),
+    ("Logic", "#9b59b6", ("Compare", "And", "Or", "Not", "If", "IfElse", "While", "For")),
+    ("Functions", "#2ecc71", ("Define Function", "Call Function", "Return")),
+    ("Data", "#1abc9c", ("List Get", "List Set", "List Append", "Dict Get", "Dict Set")),
+)
+
+@lru_cache(maxsize=256)
+def _shift_color(color, s_shift, v_shift):
+    """Return the color with its HSV saturation/value shifted, as a hex name.
+
+    Memoized because the palette and blocks derive lighter/darker shades
+    from a handful of category colors thousands of times during hovers
+    and style construction.
+    """
+    qcolor = QColor(color)
+    h, s, v, a = qcolor.getHsv()
+    qcolor.setHsv(h, min(255, max(0, s + s_shift)), min(255, max(0, v + v_shift)), a)
+    return qcolor.name()
+
+@lru_cache(maxsize=64)
+def hex_to_rgba(hex_color, alpha=1.0):
+    """Convert hex color to rgba string (memoized; the palette reuses
+    the same handful of category colors)"""
+    hex_color = hex_color.lstrip('#')
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    return f"{r}, {g}, {b}, {alpha}"
+
+def _build_styles():
+    """Build the single application-level stylesheet.
+
+    Consolidating all the static CSS into one sheet applied once on the
+    QApplication avoids per-widget CSS parsing and repeated setStyleSheet
+    dispatch during startup. Per-category group boxes are matched through
+    their "category" dynamic property.
+    """
+    styles = """
+        QMainWindow {
+            background-color: #f0f0f0;
+        }
+        QToolBar {
+            background-color: #2c3e50;
+            border: none;
+            color: white;
+            spacing: 5px;
+            padding: 3px;
+            font-weight: bold;
+        }
+        QToolBar QToolButton {
+            background-color: #3498db;
+            color: white;
+            border: none;
+            border-radius: 3px;
+            padding: 6px;
+            margin: 2px;
+            font-size: 14px;
+        }
+        QToolBar QToolButton:hover {
+            background-color: #2980b9;
+        }
+        QToolBar QToolButton:pressed {
+            background-color: #1c6ea4;
+        }
+        QScrollArea {
+            border: 1px solid #ccc;
+            border-radius: 4px;
+            background-color: #f8f8f8;
+        }
+        QGroupBox {
+            border: 1px solid #ccc;
+            border-radius: 6px;
+            margin-top: 12px;
+            font-weight: bold;
+            background-color: #f9f9f9;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px 0 5px;
+            color: #333;
+        }
+        QLabel {
+            color: #333;
+        }
+        QSplitter::handle {
+            background-color: #ccc;
+        }
+        QSplitter::handle:horizontal {
+            width: 4px;
+        }
+        QSplitter::handle:vertical {
+            height: 4px;
+        }
+        QWidget#paletteWidget, QWidget#outputWidget {
+            background-color: #f0f2f5;
+        }
+        QLabel#panelTitle {
+            font-size: 16px;
+            font-weight: bold;
+            color: #2c3e50;
+            padding: 8px;
+            border-bottom: 1px solid #ddd;
+            margin-bottom: 8px;
+        }
+        WorkspaceWidget {
+            background-color: white;
+            background-image: url('data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACgAAAAoAQMAAAC2MCouAAAABlBMVEXs7Oz////p38LwAAAAE0lEQVQI12P4DwUMo4xhxRjMAQAJMAF5dXMM2wAAAABJRU5ErkJggg==');
+            background-repeat: repeat;
+        }
+        QWidget#outputWidget QTextEdit {
+            background-color: #282c34;
+            color: #abb2bf;
+            border: 1px solid #181a1f;
+            border-radius: 4px;
+            font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+            font-size: 13px;
+            line-height: 1.5;
+            padding: 8px;
+        }
+        QTextEdit#executionOutput {
+            color: #98c379;
+        }
+    """
+
+    # Per-category group box coloring via the "category" dynamic property
+    for category, color, _blocks in CATEGORIES:
+        styles += f"""
+        QGroupBox[category="{category}"] {{
+            border: 1px solid {color};
+            border-radius: 6px;
+            margin-top: 12px;
+            font-weight: bold;
+            color: {color};
+            background-color: rgba({hex_to_rgba(color, 0.05)});
+        }}
+        QGroupBox[category="{category}"]::title {{
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px 0 5px;
+        }}
+        """
+
+    return styles
+
+STYLES = _build_styles()
+
+# Drag-over highlight for the workspace; the idle look (including the grid
+# background) comes from the application-level WorkspaceWidget rule above,
+# restored by clearing the widget-local stylesheet
+_WORKSPACE_STYLE_DRAGOVER = "WorkspaceWidget { border: 2px dashed #3498db; }"
+_WORKSPACE_STYLE_IDLE = ""
+
+# Precomputed indentation strings; deeper nesting than this is unheard of
+# but still handled by the fallback multiply in generate_code
+_INDENTS = tuple("    " * i for i in range(64))
+
+# Input slot names whose plain text values get auto-quoted, and a single
+# precompiled check for values that must be left alone (already quoted,
+# or containing a variable/expression)
+_QUOTE_NAMES = frozenset(("message", "prompt", "text"))
+_ALREADY_QUOTED = re.compile(r'^([\'"])(.*\1)?$|[{+]')
+
+class _SafeDict(dict):
+    """Mapping for format_map that leaves unknown placeholders untouched"""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+def _compile_template(template):
+    """Return a substitution callable for a block template string.
+
+    The callable takes a mapping of input names to values and fills the
+    whole template in one C-level format_map pass instead of one
+    str.replace scan per input. Templates that format_map can't parse
+    (e.g. stray braces in JSON definitions) fall back to the old
+    replace-based substitution.
+    """
+    try:
+        template.format_map(_SafeDict())
+    except (ValueError, IndexError, KeyError):
+        def substitute(values):
+            result = template
+            for name, value in values.items():
+                result = result.replace("{" + name + "}", value)
+            return result
+        return substitute
+    return template.format_map
+
+class PythonHighlighter(QSyntaxHighlighter):
+    """Line-based syntax highlighter for the code preview.
+
+    The patterns and formats are compiled once and shared at class level,
+    so refreshing the preview is a plain setPlainText instead of
+    rebuilding per-line HTML on every code-generation pass.
+    """
+
+    # (gate, pattern, format) triples applied in order, later rules
+    # winning. The gate is a cheap pre-check — a substring for `in`, or a
+    # frozenset of possible first non-space characters — that lets plain
+    # lines skip the regex entirely. Built lazily because QTextCharFormat
+    # needs a QApplication.
+    _RULES = None
+
+    def __init__(self, document):
+        super().__init__(document)
+        if PythonHighlighter._RULES is None:
+            def make_format(color):
+                fmt = QTextCharFormat()
+                fmt.setForeground(QColor(color))
+                return fmt
+
+            PythonHighlighter._RULES = (
+                ("=", QRegularExpression(r'^[^=\n]*=(?!=).*'), make_format("#d19a66")),
+                (frozenset("r"), QRegularExpression(r'^\s*return\b.*'), make_format("#e06c75")),
+                (frozenset("iefw"), QRegularExpression(r'^\s*(if|elif|else|for|while)\b.*'), make_format("#c678dd")),
+                (frozenset("dc"), QRegularExpression(r'^\s*(def|class)\b.*'), make_format("#61afef")),
+                ("#", QRegularExpression(r'#[^\n]*'), make_format("#98c379")),
+            )
+
+    def highlightBlock(self, text):
+        """Apply the precompiled rules to one line of text"""
+        stripped = text.lstrip()
+        if not stripped:
+            return
+        first = stripped[0]
+
+        for gate, pattern, char_format in self._RULES:
+            # Skip the regex when the cheap gate already rules it out
+            if isinstance(gate, frozenset):
+                if first not in gate:
+                    continue
+            elif gate not in text:
+                continue
+
+            matches = pattern.globalMatch(text)
+            while matches.hasNext():
+                match = matches.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(), char_format)
+
+# Block type definitions shared by every editor instance; built once at
+# import so window creation does not re-run ~30 QColor constructions
+_BLOCK_DEFINITIONS = {
+    # Basic blocks
+    "Print": {
+        "color": QColor(100, 180, 255),
+        "inputs": [{"name": "message", "type": "slot", "default": "Hello World"}],
+        "code_template": "print({message})"
+    },
+    "Variable": {
+        "color": QColor(255, 180, 100),
+        "inputs": [
+            {"name": "name", "type": "text", "default": "my_var"},
+            {"name": "value", "type": "slot", "default": "0"}
+        ],
+        "code_template": "{name} = {value}",
+        "output_enabled": True,
+        "output_value": "{name}"
+    },
+    "Input": {
+        "color": QColor(180, 255, 100),
+        "inputs": [
+            {"name": "variable", "type": "text", "default": "user_input"},
+            {"name": "prompt", "type": "slot", "default": "Enter something:"}
+        ],
+        "code_template": "{variable} = input({prompt})"
+    },
+    "Comment": {
+        "color": QColor(150, 150, 150),
+        "inputs": [
+            {"name": "text", "type": "text", "default": "Add your comment here"}
+        ],
+        "code_template": "# {text}"
+    },
+    "DirectCode": {
+        "color": QColor(150, 150, 150),
+        "inputs": [
+            {"name": "code", "type": "text", "default": "# Write your Python code here"}
+        ],
+        "code_template": "{code}"
+    },
+    
+    # Value blocks
+    "Value": {
+        "color": QColor(255, 200, 100),
+        "inputs": [
+            {"name": "value", "type": "text", "default": "0"}
+        ],
+        "output_enabled": True,
+        "output_value": "{value}"
+    },
+    "StringValue": {
+        "color": QColor(100, 220, 255),
+        "inputs": [
+            {"name": "text", "type": "text", "default": "text"}
+        ],
+        "output_enabled": True,
+        "output_value": "\"{text}\""
+    },
+    "NumberValue": {
+        "color": QColor(255, 220, 100),
+        "inputs": [
+            {"name": "number", "type": "text", "default": "0"}
+        ],
+        "output_enabled": True,
+        "output_value": "{number}"
+    },
+    "BooleanValue": {
+        "color": QColor(180, 150, 255),
+        "inputs": [
+            {"name": "value", "type": "choice", "options": ["True", "False"], "default": "True"}
+        ],
+        "output_enabled": True,
+        "output_value": "{value}"
+    },
+    "ListValue": {
+        "color": QColor(100, 200, 180),
+        "inputs": [
+            {"name": "items", "type": "text", "default": "1, 2, 3"}
+        ],
+        "output_enabled": True,
+        "output_value": "[{items}]"
+    },
+    "DictValue": {
+        "color": QColor(180, 200, 100),
+        "inputs": [
+            {"name": "items", "type": "text", "default": "'key1': 'value1', 'key2': 'value2'"}
+        ],
+        "output_enabled": True,
+        "output_value": "{{{items}}}"
+    },
+    
+    # Math blocks
+    "Add": {
+        "color": QColor(255, 100, 100),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "0"},
+            {"name": "b", "type": "slot", "default": "0"},
+            {"name": "result", "type": "text", "default": "result"}
+        ],
+        "code_template": "{result} = {a} + {b}",
+        "output_enabled": True,
+        "output_value": "({a} + {b})"
+    },
+    "Subtract": {
+        "color": QColor(255, 120, 120),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "0"},
+            {"name": "b", "type": "slot", "default": "0"},
+            {"name": "result", "type": "text", "default": "result"}
+        ],
+        "code_template": "{result} = {a} - {b}",
+        "output_enabled": True,
+        "output_value": "({a} - {b})"
+    },
+    "Multiply": {
+        "color": QColor(255, 140, 140),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "0"},
+            {"name": "b", "type": "slot", "default": "0"},
+            {"name": "result", "type": "text", "default": "result"}
+        ],
+        "code_template": "{result} = {a} * {b}",
+        "output_enabled": True,
+        "output_value": "({a} * {b})"
+    },
+    "Divide": {
+        "color": QColor(255, 160, 160),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "0"},
+            {"name": "b", "type": "slot", "default": "1"},
+            {"name": "result", "type": "text", "default": "result"}
+        ],
+        "code_template": "{result} = {a} / {b}",
+        "output_enabled": True,
+        "output_value": "({a} / {b})"
+    },
+    "Modulo": {
+        "color": QColor(255, 180, 180),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "0"},
+            {"name": "b", "type": "slot", "default": "1"},
+            {"name": "result", "type": "text", "default": "result"}
+        ],
+        "code_template": "{result} = {a} % {b}",
+        "output_enabled": True,
+        "output_value": "({a} % {b})"
+    },
+    "Power": {
+        "color": QColor(255, 200, 200),
+        "inputs": [
+            {"name": "base", "type": "slot", "default": "2"},
+            {"name": "exponent", "type": "slot", "default": "2"},
+            {"name": "result", "type": "text", "default": "result"}
+        ],
+        "code_template": "{result} = {base} ** {exponent}",
+        "output_enabled": True,
+        "output_value": "({base} ** {exponent})"
+    },
+    
+    # Logic blocks
+    "Compare": {
+        "color": QColor(180, 150, 255),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "0"},
+            {"name": "operator", "type": "choice", "options": ["==", "!=", ">", "<", ">=", "<="], "default": "=="},
+            {"name": "b", "type": "slot", "default": "0"}
+        ],
+        "output_enabled": True,
+        "output_value": "({a} {operator} {b})"
+    },
+    "And": {
+        "color": QColor(170, 140, 230),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "True"},
+            {"name": "b", "type": "slot", "default": "True"}
+        ],
+        "output_enabled": True,
+        "output_value": "({a} and {b})"
+    },
+    "Or": {
+        "color": QColor(190, 160, 240),
+        "inputs": [
+            {"name": "a", "type": "slot", "default": "True"},
+            {"name": "b", "type": "slot", "default": "True"}
+        ],
+        "output_enabled": True,
+        "output_value": "({a} or {b})"
+    },
+    "Not": {
+        "color": QColor(200, 170, 250),
+        "inputs": [
+            {"name": "condition", "type": "slot", "default": "True"}
+        ],
+        "output_enabled": True,
+        "output_value": "(not {condition})"
+    },
+    "If": {
+        "color": QColor(200, 100, 255),
+        "inputs": [{"name": "condition", "type": "slot", "default": "True"}],
+        "code_template": "if {condition}:",
+        "has_children": True
+    },
+    "IfElse": {
+        "color": QColor(180, 100, 200),
+        "inputs": [{"name": "condition", "type": "slot", "default": "True"}],
+        "code_template": "if {condition}:",
+        "else_template": "else:",
+        "has_children": True,
+        "has_else_children": True
+    },
+    "While": {
+        "color": QColor(100, 255, 200),
+        "inputs": [{"name": "condition", "type": "slot", "default": "True"}],
+        "code_template": "while {condition}:",
+        "has_children": True
+    },
+    "For": {
+        "color": QColor(100, 200, 255),
+        "inputs": [
+            {"name": "variable", "type": "text", "default": "i"},
+            {"name": "iterable", "type": "slot", "default": "range(10)"}
+        ],
+        "code_template": "for {variable} in {iterable}:",
+        "has_children": True
+    },
+    
+    # Function blocks
+    "Define Function": {
+        "color": QColor(100, 200, 150),
+        "inputs": [
+            {"name": "name", "type": "text", "default": "my_function"},
+            {"name": "params", "type": "text", "default": ""}
+        ],
+        "code_template": "def {name}({params}):",
+        "has_children": True
+    },
+    "Call Function": {
+        "color": QColor(120, 220, 170),
+        "inputs": [
+            {"name": "name", "type": "text", "default": "my_function"},
+            {"name": "args", "type": "text", "default": ""}
+        ],
+        "code_template": "{name}({args})",
+        "output_enabled": True,
+        "output_value": "{name}({args})"
+    },
+    "Return": {
+        "color": QColor(140, 240, 190),
+        "inputs": [
+            {"name": "value", "type": "slot", "default": ""}
+        ],
+        "code_template": "return {value}"
+    },
+    
+    # Data structure blocks
+    "List Get": {
+        "color": QColor(100, 180, 200),
+        "inputs": [
+            {"name": "list", "type": "slot", "default": "my_list"},
+            {"name": "index", "type": "slot", "default": "0"}
+        ],
+        "output_enabled": True,
+        "output_value": "{list}[{index}]"
+    },
+    "List Set": {
+        "color": QColor(120, 200, 220),
+        "inputs": [
+            {"name": "list", "type": "slot", "default": "my_list"},
+            {"name": "index", "type": "slot", "default": "0"},
+            {"name": "value", "type": "slot", "default": "new_value"}
+        ],
+        "code_template": "{list}[{index}] = {value}"
+    },
+    "List Append": {
+        "color": QColor(140, 220, 240),
+        "inputs": [
+            {"name": "list", "type": "slot", "default": "my_list"},
+            {"name": "value", "type": "slot", "default": "new_item"}
+        ],
+        "code_template": "{list}.append({value})"
+    },
+    "Dict Get": {
+        "color": QColor(180, 200, 100),
+        "inputs": [
+            {"name": "dict", "type": "slot", "default": "my_dict"},
+            {"name": "key", "type": "slot", "default": "'key'"}
+        ],
+        "output_enabled": True,
+        "output_value": "{dict}[{key}]"
+    },
+    "Dict Set": {
+        "color": QColor(200, 220, 120),
+        "inputs": [
+            {"name": "dict", "type": "slot", "default": "my_dict"},
+            {"name": "key", "type": "slot", "default": "'key'"},
+            {"name": "value", "type": "slot", "default": "new_value"}
+        ],
+        "code_template": "{dict}[{key}] = {value}"
+    }
+}
+
+class BlockInputSlot(QFrame):
+    """A slot where other blocks can be inserted as input"""
+
+    # Stylesheets for the slot states, built once at import time.
+    # Reusing these constants (with a change guard below) avoids Qt
+    # re-parsing and re-polishing CSS on every drag event.
+    _STYLE_NORMAL = """
+        BlockInputSlot {
+            background-color: rgba(255, 255, 255, 180);
+            border: 1px dashed #666;
+            border-radius: 4px;
+        }
+        BlockInputSlot:hover {
+            border: 2px dashed #444;
+            background-color: rgba(240, 240, 255, 220);
+        }
+        QLineEdit {
+            border: 1px solid #bbb;
+            border-radius: 3px;
+            padding: 2px;
+            background-color: #fdfdfd;
+        }
+    """
+    _STYLE_HOVER = """
+        BlockInputSlot {
+            background-color: rgba(220, 240, 255, 220);
+            border: 2px dashed #4080C0;
+            border-radius: 4px;
+        }
+    """
+    # Weakref to the owning CodeBlockEditor, filled lazily by get_main_window
+    _main_window_ref = None
+
+    def __init__(self, parent=None, name="", default_text=""):
+        super().__init__(parent)
+        self.name = name
+        self.default_text = default_text
+        self.contained_block = None
+        self._current_style = None
+
+        self.setAcceptDrops(True)
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setMinimumHeight(30)
+        self.setMaximumHeight(40)
+        self.setMinimumWidth(100)
+
+        self.layout = QHBoxLayout(self)
+        self.layout.setContentsMargins(5, 2, 5, 2)
+
+        # Use a line edit for text input when no block is inserted
+        self.text_input = QLineEdit(default_text)
+        self.text_input.textChanged.connect(self._mark_block_dirty)
+        self.layout.addWidget(self.text_input)
+
+        # Set styling - improved contrast and visibility
+        self._apply_style(self._STYLE_NORMAL)
+
+    def _apply_style(self, style):
+        """Set a stylesheet only if it differs from the current one"""
+        if self._current_style is not style:
+            self.setStyleSheet(style)
+            self._current_style = style
+
+    def _mark_block_dirty(self, *args):
+        """Invalidate the cached code of the block owning this slot"""
+        parent = self.parent()
+        while parent is not None:
+            if isinstance(parent, CodeBlock):
+                parent._mark_dirty()
+                return
+            parent = parent.parent()
+
+    def dragEnterEvent(self, event):
+        """Allow dragging blocks into this slot"""
+        if event.mimeData().hasText():
+            event.acceptProposedAction()
+            self._apply_style(self._STYLE_HOVER)
+
+    def dragLeaveEvent(self, event):
+        """Reset styling when drag leaves"""
+        self._apply_style(self._STYLE_NORMAL)
+            
+    def dropEvent(self, event):
+        """Handle dropping a block into this slot"""
+        block_type = sys.intern(event.mimeData().text())
+        
+        # Find main window to get block definitions
+        main_window = self.get_main_window()
+        if not main_window:
+            return
+            
+        # Suspend repaints so replacing the contained block triggers a
+        # single layout pass instead of one per widget change
+        self.setUpdatesEnabled(False)
+        try:
+            # Create a new block in this slot
+            if self.contained_block:
+                self.contained_block.setParent(None)
+                self.contained_block.deleteLater()
+
+            # Create the new block, passing the definition we can resolve
+            # here so the constructor skips its own lookup
+            self.contained_block = CodeBlock(
+                block_type, self, is_nested=True,
+                definition=main_window.block_definitions.get(block_type))
+
+            # Hide the text input and add the block
+            self.text_input.hide()
+            self.layout.addWidget(self.contained_block)
+            self._mark_block_dirty()
+        finally:
+            self.setUpdatesEnabled(True)
+
+        # Reset styling
+        self._apply_style(self._STYLE_NORMAL)
+
+        event.acceptProposedAction()
+        
+    def get_main_window(self):
+        """Get reference to the main window (cached after the first walk)"""
+        if self._main_window_ref is not None:
+            main_window = self._main_window_ref()
+            if main_window is not None:
+                return main_window
+        parent = self.parent()
+        while parent:
+            if isinstance(parent, CodeBlockEditor):
+                self._main_window_ref = weakref.ref(parent)
+                return parent
+            parent = parent.parent()
+        return None
+
+    def get_value(self):
+        """Get the value of this input slot - either text or generated code from a nested block"""
+        if self.contained_block:
+            # Generate code from the contained block
+            return self.contained_block.generate_code(include_indent=False)
+        else:
+            # Return the text value, handle string formatting
+            value = self.text_input.text()
+            
+            # If this is a prompt or message, automatically add quotes if they're not there
+            # and the text looks like a string (no variables or expressions)
+            if self.name in _QUOTE_NAMES and not _ALREADY_QUOTED.search(value):
+                return f'"{value}"'
+            return value
+        
+    def clear(self):
+        """Clear the slot"""
+        self.setUpdatesEnabled(False)
+        try:
+            if self.contained_block:
+                self.contained_block.setParent(None)
+                self.contained_block.deleteLater()
+                self.contained_block = None
+
+            self.text_input.setText(self.default_text)
+            self.text_input.show()
+            self._mark_block_dirty()
+        finally:
+            self.setUpdatesEnabled(True)
+        
+    def to_json(self):
+        """Serialize the slot to JSON"""
+        if self.contained_block:
+            return {
+                "type": "block",
+                "block": self.contained_block.to_json()
+            }
+        else:
+            return {
+                "type": "text",
+                "value": self.text_input.text()
+            }
+            
+    def from_json(self, data, main_window):
+        """Deserialize the slot from JSON"""
+        if data.get("type") == "block" and "block" in data:
+            block_type = data["block"].get("type")
+            if block_type:
+                # Populate the nested tree before inserting it into the
+                # layout so the whole subtree costs one layout pass
+                self.contained_block = CodeBlock(
+                    block_type, self, is_nested=True,
+                    definition=main_window.block_definitions.get(block_type))
+                self.contained_block.from_json(data["block"], main_window)
+                self.text_input.hide()
+                self._mark_block_dirty()
+                self.layout.addWidget(self.contained_block)
+        else:
+            self.text_input.setText(data.get("value", self.default_text))
+            self.text_input.show()
+
+class CodeBlockEditor(QMainWindow):
+    """Main window for the Python Block Code editor"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Python Block Code Editor")
+        self.setGeometry(100, 100, 1200, 800)
+
+        # Application styling lives in the module-level STYLES sheet,
+        # applied once on the QApplication in main()
+
+        # Main widget and layout
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.main_layout = QHBoxLayout(self.central_widget)
+        
+        # Create splitter for resizable panels
+        self.splitter = QSplitter(Qt.Horizontal)
+        self.main_layout.addWidget(self.splitter)
+        
+        # Build the panels with repaints suspended so Qt runs a single
+        # polish/layout pass once everything is in place instead of
+        # restyling after each widget insertion
+        self.setUpdatesEnabled(False)
+        try:
+            # Block palette panel
+            self.setup_block_palette()
+
+            # Workspace panel
+            self.setup_workspace()
+
+            # Output panel
+            self.setup_output_panel()
+
+            # Setup toolbar
+            self.setup_toolbar()
+        finally:
+            self.setUpdatesEnabled(True)
+
+        # Initialize block types
+        self.initialize_block_types()
+
+        # Coalesces preview refreshes while the user types or drops
+        # blocks, so rapid edits cost one regeneration instead of one
+        # per keystroke
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(100)
+        self._preview_timer.timeout.connect(self.generate_code)
+
+    def schedule_preview(self):
+        """Request a debounced refresh of the code preview"""
+        self._preview_timer.start()
+        
+    def setup_block_palette(self):
+        """Set up the panel containing block categories and blocks"""
+        self.palette_widget = QWidget()
+        self.palette_widget.setObjectName("paletteWidget")
+        self.palette_layout = QVBoxLayout(self.palette_widget)
+
+        # Title for palette
+        palette_title = QLabel("Block Palette")
+        palette_title.setObjectName("panelTitle")
+        self.palette_layout.addWidget(palette_title)
+
+        # Create the category group boxes now but defer the ~30 palette
+        # item widgets to the first idle tick, so the window appears
+        # without paying for their construction and styling up front
+        self._pending_palette_groups = []
+        for category, color, blocks in CATEGORIES:
+            group = QGroupBox(category)
+            # Colored through the per-category selectors in STYLES
+            group.setProperty("category", category)
+            group_layout = QVBoxLayout()
+            group_layout.setSpacing(4)
+
+            group.setLayout(group_layout)
+            self.palette_layout.addWidget(group)
+            self._pending_palette_groups.append((group_layout, color, blocks))
+
+        QTimer.singleShot(0, self.populate_block_palette)
+
+        # Add stretch to push blocks to the top
+        self.palette_layout.addStretch(1)
+
+        # Create scroll area for palette
+        palette_scroll = QScrollArea()
+        palette_scroll.setWidgetResizable(True)
+        palette_scroll.setWidget(self.palette_widget)
+
+        self.splitter.addWidget(palette_scroll)
+
+    def populate_block_palette(self):
+        """Create the draggable palette items for each category group"""
+        # Suspend repaints so the whole batch costs one layout pass
+        # instead of one per inserted item
+        self.palette_widget.setUpdatesEnabled(False)
+        try:
+            for group_layout, color, blocks in self._pending_palette_groups:
+                for block_type in blocks:
+                    block = BlockPaletteItem(block_type, color)
+                    group_layout.addWidget(block)
+        finally:
+            self.palette_widget.setUpdatesEnabled(True)
+        self._pending_palette_groups = []
+
+    def setup_workspace(self):
+        """Set up the main workspace where blocks will be arranged"""
+        # The faint grid pattern comes from the WorkspaceWidget rule in STYLES
+        self.workspace = WorkspaceWidget()
+
+        # Create a container for the workspace with a title
+        workspace_container = QWidget()
+        workspace_layout = QVBoxLayout(workspace_container)
+
+        # Title for workspace
+        workspace_title = QLabel("Workspace")
+        workspace_title.setObjectName("panelTitle")
+        workspace_layout.addWidget(workspace_title)
+        
+        # Create scroll area for workspace
+        workspace_scroll = QScrollArea()
+        workspace_scroll.setWidgetResizable(True)
+        workspace_scroll.setWidget(self.workspace)
+        workspace_layout.addWidget(workspace_scroll)
+        
+        self.splitter.addWidget(workspace_container)
+        
+    def setup_output_panel(self):
+        """Set up the output panel for code preview and execution results"""
+        self.output_widget = QWidget()
+        self.output_widget.setObjectName("outputWidget")
+        self.output_layout = QVBoxLayout(self.output_widget)
+
+        # Title for output
+        output_title = QLabel("Output")
+        output_title.setObjectName("panelTitle")
+        self.output_layout.addWidget(output_title)
+
+        # Code preview
+        self.code_preview_label = QLabel("Python Code:")
+        self.code_preview_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-top: 5px;")
+        self.output_layout.addWidget(self.code_preview_label)
+
+        # Dark editor styling comes from the QWidget#outputWidget QTextEdit
+        # rules in STYLES; coloring is done by the shared highlighter
+        self.code_preview = QTextEdit()
+        self.code_preview.setReadOnly(True)
+        self.highlighter = PythonHighlighter(self.code_preview.document())
+        self.output_layout.addWidget(self.code_preview)
+
+        # Execution output
+        self.execution_label = QLabel("Execution Output:")
+        self.execution_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-top: 10px;")
+        self.output_layout.addWidget(self.execution_label)
+
+        self.execution_output = QTextEdit()
+        self.execution_output.setObjectName("executionOutput")
+        self.execution_output.setReadOnly(True)
+        self.output_layout.addWidget(self.execution_output)
+        
+        # Add to splitter
+        self.splitter.setSizes([250, 600, 350])
+        
+    def setup_toolbar(self):
+        """Set up the application toolbar"""
+        toolbar = QToolBar("Main Toolbar")
+        toolbar.setIconSize(QSize(24, 24))
+        toolbar.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.addToolBar(toolbar)
+        
+        # Run button
+        run_action = QAction("▶ Run", self)
+        run_action.setStatusTip("Execute the generated Python code")
+        run_action.triggered.connect(self.run_code)
+        toolbar.addAction(run_action)
+        
+        toolbar.addSeparator()
+        
+        # Save button
+        save_action = QAction("💾 Save", self)
+        save_action.setStatusTip("Save current project")
+        save_action.triggered.connect(self.save_project)
+        toolbar.addAction(save_action)
+        
+        # Load button
+        load_action = QAction("📂 Load", self)
+        load_action.setStatusTip("Load a project")
+        load_action.triggered.connect(self.load_project)
+        toolbar.addAction(load_action)
+        
+        toolbar.addSeparator()
+        
+        # Clear workspace button
+        clear_action = QAction("🗑 Clear", self)
+        clear_action.setStatusTip("Clear the workspace")
+        clear_action.triggered.connect(self.clear_workspace)
+        toolbar.addAction(clear_action)
+        
+        # Add an about button
+        toolbar.addSeparator()
+        about_action = QAction("ℹ️ About", self)
+        about_action.setStatusTip("About this application")
+        about_action.triggered.connect(self.show_about)
+        toolbar.addAction(about_action)
+        
+        # Add status bar
+        self.statusBar().showMessage("Ready")
+        
+    def show_about(self):
+        """Show about dialog"""
+        QMessageBox.about(self, "About Python Block Code Editor", 
+                         """<h2>Python Block Code Editor</h2>
+                         <p>A visual programming environment for Python that allows 
+                         you to create Python programs by dragging and dropping code blocks, 
+                         similar to Sketchware/Kodular for Java.</p>
+                         <p>Features include:</p>
+                         <ul>
+                         <li>Nestable blocks</li>
+                         <li>Direct code insertion</li>
+                         <li>Real-time code preview</li>
+                         <li>JSON-based block definitions</li>
+                         </ul>
+                         <p><small>Version 1.0.0</small></p>""")
+        
+    def initialize_block_types(self):
+        """Initialize the block type definitions"""
+        # Shallow-copy the shared module-level definitions so JSON merging
+        # below stays per-instance; the QColor values are shared. Keys are
+        # interned so lookups against interned drop/mime strings become
+        # pointer compares.
+        self.block_definitions = {
+            sys.intern(block_type): def_data
+            for block_type, def_data in _BLOCK_DEFINITIONS.items()
+        }
+        
+        # Overlay definitions from JSON if available; the parse is
+        # memoized on the file's mtime so opening another editor window
+        # doesn't re-read an unchanged file
+        try:
+            if os.path.exists(BLOCK_DEFINITIONS_FILE):
+                self.block_definitions.update(_load_block_def_overrides(
+                    BLOCK_DEFINITIONS_FILE, os.path.getmtime(BLOCK_DEFINITIONS_FILE)))
+        except Exception as e:
+            print(f"Error loading block definitions: {e}")
+
+        # Precompile the templates once so each code-generation pass is a
+        # single substitution call instead of re-scanning the template for
+        # every input; input names are interned for the same
+        # pointer-compare reason as the definition keys
+        for block_type, def_data in self.block_definitions.items():
+            def_data["_code_tmpl"] = _compile_template(
+                def_data.get("code_template", f"# {block_type}"))
+            def_data["_output_tmpl"] = _compile_template(
+                def_data.get("output_value", ""))
+            for input_def in def_data.get("inputs", ()):
+                if "name" in input_def:
+                    input_def["name"] = sys.intern(input_def["name"])
+        
+    def generate_code(self):
+        """Generate Python code from blocks in the workspace"""
+        code = self.workspace.generate_code()
+        
+        # The PythonHighlighter attached to the preview document colors
+        # the text, so no per-line HTML needs to be built here
+        self.code_preview.setPlainText(code)
+        return code
+        
+    def run_code(self):
+        """Run the generated Python code"""
+        code = self.generate_code()
+        self.execution_output.clear()
+        
+        try:
+            # Redirect stdout to capture print output
+            import io
+            from contextlib import redirect_stdout
+
+            # Compile is cached per source string, so re-running the same
+            # code only pays for the exec; the explicit globals dict also
+            # keeps user code from leaking into module state
+            code_obj = _compile_cached(code)
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                exec(code_obj, {"__name__": "__main__"})
+
+            self.execution_output.setText(output.getvalue())
+        except Exception as e:
+            self.execution_output.setText(f"Error: {str(e)}")
+            
+    def save_project(self):
+        """Save the current project to a file"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Save Project", "", "Python Block Code Project (*.pbc);;All Files (*)")
+        
+        if not filename:
+            return
+        
+        # Add extension if it doesn't have one
+        if not filename.endswith('.pbc'):
+            filename += '.pbc'
+        
+        try:
+            # Create project data
+            project_data = self.workspace.to_json()
+            
+            # Write to file
+            _write_project_json(project_data, filename)
+                
+            QMessageBox.information(self, "Save Successful", f"Project saved successfully to {filename}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Save Error", f"An error occurred while saving: {str(e)}")
+        
+    def load_project(self):
+        """Load a project from a file"""
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Load Project", "", "Python Block Code Project (*.pbc);;All Files (*)")
+        
+        if not filename:
+            return
+        
+        try:
+            # Load project data
+            with open(filename, 'r') as f:
+                project_data = _load_project_json(f)
+                
+            # Apply to workspace; from_json batches its own repaints
+            self.workspace.from_json(project_data, self)
+
+            # Update code preview
+            self.generate_code()
+            
+            QMessageBox.information(self, "Load Successful", f"Project loaded successfully from {filename}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Load Error", f"An error occurred while loading: {str(e)}")
+        
+    def clear_workspace(self):
+        """Clear all blocks from the workspace"""
+        self.workspace.clear()
+        
+
+class BlockPaletteItem(QFrame):
+    """Represents a block in the palette that can be dragged to the workspace"""
+    
+    def __init__(self, block_type, color="#3498db"):
+        super().__init__()
+        self.block_type = block_type
+        self.color = color
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setLineWidth(1)
+        self.setMinimumHeight(40)
+        self.setMaximumHeight(40)
+        
+        # Set rounded corners and gradient background - improved visuals;
+        # the strings come from the per-color cache so items of the same
+        # category share one parsed stylesheet
+        self._current_style = None
+        self._apply_style(self._styles_for(color)[0])
+        
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(10, 4, 10, 4)
+        
+        # Add an icon or indicator
+        icon_label = QLabel("◆")
+        icon_label.setMaximumWidth(20)
+        icon_label.setStyleSheet("color: rgba(255, 255, 255, 0.7); background: transparent; border: none;")
+        layout.addWidget(icon_label)
+        
+        # Add the main text label
+        label = QLabel(block_type)
+        label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        label.setStyleSheet("color: white; font-weight: bold; background: transparent; border: none;")
+        layout.addWidget(label)
+        
+        # Make cursor indicate draggability
+        self.setCursor(Qt.OpenHandCursor)
+        
+    def darker_color(self, color):
+        """Return a darker version of the color"""
+        return _shift_color(color, 0, -30)
+
+    def lighter_color(self, color):
+        """Return a lighter version of the color"""
+        return _shift_color(color, -10, 30)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _styles_for(color):
+        """Build the (normal, dragging) stylesheet pair for a color once"""
+        darker = _shift_color(color, 0, -30)
+        lighter = _shift_color(color, -10, 30)
+        normal = f"""
+            BlockPaletteItem {{
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 {color}, stop:1 {darker});
+                color: white;
+                border-radius: 6px;
+                border: 1px solid {darker};
+            }}
+            BlockPaletteItem:hover {{
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 {lighter}, stop:1 {color});
+                border: 1px solid {_shift_color(darker, 0, -30)};
+            }}
+        """
+        dragging = f"""
+            BlockPaletteItem {{
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 {color}, stop:1 {darker});
+                color: white;
+                border-radius: 6px;
+                border: 1px solid {darker};
+                opacity: 0.7;
+            }}
+        """
+        return normal, dragging
+
+    def _apply_style(self, style):
+        """Set a stylesheet only if it differs from the current one"""
+        if self._current_style is not style:
+            self.setStyleSheet(style)
+            self._current_style = style
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_start_position = event.pos()
+            self.setCursor(Qt.ClosedHandCursor)  # Change cursor on click
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.setCursor(Qt.OpenHandCursor)  # Restore cursor
+            
+    def mouseMoveEvent(self, event):
+        if not (event.buttons() & Qt.LeftButton):
+            return
+            
+        if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
+            return
+            
+        drag = QDrag(self)
+        mime_data = QMimeData()
+        mime_data.setText(self.block_type)
+        drag.setMimeData(mime_data)
+        
+        # Create a nice looking drag pixmap with shadow effect
+        pixmap = self.grab()
+        drag.setPixmap(pixmap)
+        drag.setHotSpot(event.pos())
+        
+        normal, dragging = self._styles_for(self.color)
+
+        # Show feedback to user
+        self._apply_style(dragging)
+
+        result = drag.exec_(Qt.CopyAction)
+
+        # Restore normal appearance
+        self._apply_style(normal)
+        self.setCursor(Qt.OpenHandCursor)  # Restore cursor
+
+
+class CodeBlock(QFrame):
+    """Represents a code block in the workspace"""
+
+    # Weakref to the owning CodeBlockEditor, filled lazily by get_main_window
+    _main_window_ref = None
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _style_for(rgb, is_nested):
+        """Build the block stylesheet once per (color, nesting) pair.
+
+        Keyed on the integer rgb value so constructing a block costs one
+        int read rather than a hex-string round trip; blocks of the same
+        type share the identical cached string, so Qt only reparses the
+        CSS for the first block of each color.
+        """
+        color_name = QColor.fromRgb(rgb).name()
+
+        # Gradient effect for the block - improved with better contrast
+        gradient_color = _shift_color(color_name, -20, 40)
+        dark_border = _shift_color(color_name, 20, -40)
+
+        base_style = f"""
+            CodeBlock {{
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 {gradient_color}, stop:1 {color_name});
+                border-radius: 8px;
+                border: 2px solid {dark_border};
+            }}
+            QLabel {{
+                color: black;
+                background: transparent;
+                border: none;
+            }}
+            QLineEdit {{
+                border: 1px solid #bbb;
+                border-radius: 4px;
+                padding: 3px;
+                background: white;
+                selection-background-color: {color_name};
+            }}
+            QLineEdit:focus {{
+                border: 1px solid {color_name};
+                background: #fafafa;
+            }}
+            QPushButton {{
+                background: #e74c3c;
+                color: white;
+                border-radius: 10px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background: #c0392b;
+            }}
+        """
+
+        # Add shadow or hover effects for non-nested blocks
+        if not is_nested:
+            base_style += f"""
+                CodeBlock:hover {{
+                    border: 2px solid {_shift_color(dark_border, 20, -40)};
+                }}
+            """
+
+        return base_style
+
+    def __init__(self, block_type, parent=None, is_nested=False, definition=None):
+        super().__init__(parent)
+        self.block_type = block_type
+        self.input_widgets = {}
+        self.input_slots = {}
+        self.child_blocks = []
+        self.else_blocks = []
+        self.is_nested = is_nested  # Whether this block is nested in an input slot
+
+        # Cached generate_code results, invalidated through _mark_dirty
+        # whenever an input or the child structure changes
+        self._dirty = True
+        self._code_cache = {}
+
+        # Rendered drag pixmap, reused across drags until the block's
+        # appearance can change (input edit or resize)
+        self._drag_pixmap = None
+
+        # Timestamp of the last processed mouse move, for throttling
+        self._last_move_ns = 0
+
+        # Weakref to the containing workspace, cleared on reparent
+        self._workspace_ref = None
+
+        # Python-side mirror of the input widget values, kept current by
+        # the change signals so code generation never crosses into Qt
+        self._input_values = {}
+        
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setLineWidth(2)
+        
+        if is_nested:
+            self.setMinimumHeight(30)
+            self.setMaximumHeight(40)
+        else:
+            self.setMinimumHeight(50)
+            
+        self.setMinimumWidth(200)
+        
+        # Use the pre-resolved definition when the caller already has it,
+        # otherwise look it up on the parent window
+        if definition is None:
+            main_window = self.get_main_window()
+            if main_window:
+                definition = main_window.block_definitions.get(block_type)
+
+        if definition is not None:
+            self.definition = definition
+            bg_color = self.definition.get("color", QColor(200, 200, 200))
+            self.setStyleSheet(self._style_for(bg_color.rgb(), is_nested))
+        else:
+            self.definition = {
+                "inputs": [],
+                "code_template": f"# {block_type}",
+                "_code_tmpl": _compile_template(f"# {block_type}"),
+                "_output_tmpl": _compile_template(""),
+                "has_children": False
+            }
+            self.setStyleSheet("""
+                CodeBlock {
+                    background: #e0e0e0;
+                    border-radius: 8px;
+                    border: 2px solid #aaaaaa;
+                }
+                CodeBlock:hover {
+                    border: 2px solid #888888;
+                }
+            """)
+        
+        # Create layout
+        self.layout = QVBoxLayout(self)
+        self.layout.setSpacing(5)
+        self.layout.setContentsMargins(10, 5, 10, 5)
+        
+        # Header with block type
+        header_layout = QHBoxLayout()
+        
+        # Add a small indicator icon for the block type
+        if not is_nested:
+            icon_label = QLabel("◆")
+            icon_label.setMaximumWidth(20)
+            icon_label.setStyleSheet("color: rgba(0, 0, 0, 0.4); font-size: 12px;")
+            header_layout.addWidget(icon_label)
+        
+        # Add the block title
+        header_label = QLabel(block_type)
+        if is_nested:
+            header_label.setStyleSheet("font-weight: bold; font-size: 12px;")
+        else:
+            header_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        header_layout.addWidget(header_label)
+        
+        # Add spacer
+        header_layout.addStretch(1)
+        
+        # Don't add delete button for nested blocks
+        if not is_nested:
+            # Add delete button
+            delete_button = QPushButton("×")
+            delete_button.setMaximumWidth(20)
+            delete_button.setMaximumHeight(20)
+            delete_button.setToolTip("Delete this block")
+            delete_button.clicked.connect(self.remove_block)
+            header_layout.addWidget(delete_button)
+        
+        self.layout.addLayout(header_layout)
+        
+        # Add input fields based on block definition
+        self.setup_inputs()
+        
+        # For nested blocks, we reduce the size and simplify the UI
+        if is_nested:
+            self.setFrameShape(QFrame.NoFrame)
+            self.layout.setContentsMargins(0, 0, 0, 0)
+            self.layout.setSpacing(2)
+            
+        # If block can have children, add container for them
+        if self.definition.get("has_children", False) and not is_nested:
+            self.setup_child_container()
+            
+            # Also setup else container if needed
+            if self.definition.get("has_else_children", False):
+                self.setup_else_container()
+        
+        # Make block draggable unless it's nested
+        if not is_nested:
+            self.setMouseTracking(True)
+            self.dragging = False
+            self.drag_start_position = None
+            self.setCursor(Qt.OpenHandCursor)  # Set cursor to indicate draggability
+            
+    def setup_child_container(self):
+        """Setup container for child blocks"""
+        self.child_container = QWidget(self)
+        self.child_container.setStyleSheet("""
+            background: rgba(255, 255, 255, 120);
+            border-radius: 6px;
+            border: 1px dashed rgba(0, 0, 0, 0.2);
+        """)
+        self.child_layout = QVBoxLayout(self.child_container)
+        self.child_layout.setContentsMargins(20, 5, 5, 5)
+        self.layout.addWidget(self.child_container)
+        
+        # Add a placeholder for dropping blocks
+        self.drop_placeholder = QLabel("Drop blocks here")
+        self.drop_placeholder.setAlignment(Qt.AlignCenter)
+        self.drop_placeholder.setStyleSheet("""
+            background-color: rgba(200, 200, 200, 100);
+            border: 1px dashed gray;
+            border-radius: 4px;
+            color: #555;
+            padding: 10px;
+            margin: 5px;
+        """)
+        self.drop_placeholder.setMinimumHeight(40)
+        self.child_layout.addWidget(self.drop_placeholder)
+        
+        # Make the child container accept drops
+        self.child_container.setAcceptDrops(True)
+        self.child_container.dragEnterEvent = self.child_drag_enter
+        self.child_container.dropEvent = self.child_drop_event
+        
+    def child_drag_enter(self, event):
+        """Handle drag enter on child container"""
+        if event.mimeData().hasText():
+            self.child_container.setStyleSheet("""
+                background: rgba(220, 240, 255, 180);
+                border-radius: 6px;
+                border: 1px dashed rgba(0, 0, 150, 0.3);
+            """)
+            event.acceptProposedAction()
+            
+    def child_drop_event(self, event):
+        """Handle drop on child container"""
+        block_type = sys.intern(event.mimeData().text())
+        
+        # Create a new block
+        new_block = CodeBlock(block_type, self.child_container)
+        self.child_layout.insertWidget(self.child_layout.count() - 1, new_block)  # Insert before placeholder
+        self.child_blocks.append(new_block)
+        self._mark_dirty()
+        
+        # Reset styling
+        self.child_container.setStyleSheet("""
+            background: rgba(255, 255, 255, 120);
+            border-radius: 6px;
+            border: 1px dashed rgba(0, 0, 0, 0.2);
+        """)
+        
+        event.acceptProposedAction()
+        
+    def setup_else_container(self):
+        """Setup container for else blocks"""
+        # Add an 'else' label
+        else_label = QLabel("else:")
+        else_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        self.layout.addWidget(else_label)
+        
+        self.else_container = QWidget(self)
+        self.else_container.setStyleSheet("""
+            background: rgba(255, 255, 255, 120);
+            border-radius: 6px;
+            border: 1px dashed rgba(0, 0, 0, 0.2);
+        """)
+        self.else_layout = QVBoxLayout(self.else_container)
+        self.else_layout.setContentsMargins(20, 5, 5, 5)
+        self.layout.addWidget(self.else_container)
+        
+        # Add a placeholder for dropping blocks
+        self.else_drop_placeholder = QLabel("Drop 'else' blocks here")
+        self.else_drop_placeholder.setAlignment(Qt.AlignCenter)
+        self.else_drop_placeholder.setStyleSheet("""
+            background-color: rgba(200, 200, 200, 100);
+            border: 1px dashed gray;
+            border-radius: 4px;
+            color: #555;
+            padding: 10px;
+            margin: 5px;
+        """)
+        self.else_drop_placeholder.setMinimumHeight(40)
+        self.else_layout.addWidget(self.else_drop_placeholder)
+        
+        # Make the else container accept drops
+        self.else_container.setAcceptDrops(True)
+        self.else_container.dragEnterEvent = self.else_drag_enter
+        self.else_container.dropEvent = self.else_drop_event
+        
+    def else_drag_enter(self, event):
+        """Handle drag enter on else container"""
+        if event.mimeData().hasText():
+            self.else_container.setStyleSheet("""
+                background: rgba(220, 240, 255, 180);
+                border-radius: 6px;
+                border: 1px dashed rgba(0, 0, 150, 0.3);
+            """)
+            event.acceptProposedAction()
+            
+    def else_drop_event(self, event):
+        """Handle drop on else container"""
+        block_type = sys.intern(event.mimeData().text())
+        
+        # Create a new block
+        new_block = CodeBlock(block_type, self.else_container)
+        self.else_layout.insertWidget(self.else_layout.count() - 1, new_block)  # Insert before placeholder
+        self.else_blocks.append(new_block)
+        self._mark_dirty()
+        
+        # Reset styling
+        self.else_container.setStyleSheet("""
+            background: rgba(255, 255, 255, 120);
+            border-radius: 6px;
+            border: 1px dashed rgba(0, 0, 0, 0.2);
+        """)
+        
+        event.acceptProposedAction()
+    
+    def lighter_color(self, color):
+        """Return a lighter version of the color"""
+        return _shift_color(color, -20, 40)
+
+    def darker_color(self, color):
+        """Return a darker version of the color"""
+        return _shift_color(color, 20, -40)
+    
+    def setup_inputs(self):
+        """Set up input fields based on block definition"""
+        if "inputs" not in self.definition:
+            return
+            
+        inputs_layout = QFormLayout()
+        inputs_layout.setContentsMargins(5, 0, 5, 0)
+        inputs_layout.setVerticalSpacing(5)
+        inputs_layout.setHorizontalSpacing(10)
+        
+        for input_def in self.definition["inputs"]:
+            name = input_def["name"]
+            input_type = input_def.get("type", "text")
+            default = input_def.get("default", "")
+            
+            if input_type == "text":
+                input_widget = QLineEdit(default)
+                # Add placeholder text
+                input_widget.setPlaceholderText(f"Enter {name}...")
+                self._input_values[name] = default
+                input_widget.textChanged.connect(self._on_input_changed(name))
+                self.input_widgets[name] = input_widget
+                inputs_layout.addRow(f"{name}:", input_widget)
+            elif input_type == "choice":
+                input_widget = QComboBox()
+                for option in input_def.get("options", []):
+                    input_widget.addItem(option)
+                if default:
+                    input_widget.setCurrentText(default)
+                self._input_values[name] = input_widget.currentText()
+                input_widget.currentTextChanged.connect(self._on_input_changed(name))
+                self.input_widgets[name] = input_widget
+                inputs_layout.addRow(f"{name}:", input_widget)
+            elif input_type == "slot":
+                # Create a slot that can accept other blocks
+                input_slot = BlockInputSlot(self, name, default)
+                self.input_slots[name] = input_slot
+                inputs_layout.addRow(f"{name}:", input_slot)
+            
+        self.layout.addLayout(inputs_layout)
+        
+    def get_main_window(self):
+        """Get reference to the main window (cached after the first walk)"""
+        if self._main_window_ref is not None:
+            main_window = self._main_window_ref()
+            if main_window is not None:
+                return main_window
+        parent = self.parent()
+        while parent:
+            if isinstance(parent, CodeBlockEditor):
+                self._main_window_ref = weakref.ref(parent)
+                return parent
+            parent = parent.parent()
+        return None
+
+    def get_workspace(self):
+        """Get the containing workspace (cached until reparented)"""
+        if self._workspace_ref is not None:
+            workspace = self._workspace_ref()
+            if workspace is not None:
+                return workspace
+        parent = self.parent()
+        while parent:
+            if isinstance(parent, WorkspaceWidget):
+                self._workspace_ref = weakref.ref(parent)
+                return parent
+            parent = parent.parent()
+        return None
+
+    def changeEvent(self, event):
+        # Reparenting invalidates the cached workspace lookup
+        if event.type() == QEvent.ParentChange:
+            self._workspace_ref = None
+        super().changeEvent(event)
+
+    def _on_input_changed(self, name):
+        """Build a slot that mirrors an input's new value and marks us dirty"""
+        def handler(value):
+            self._input_values[name] = value
+            self._mark_dirty()
+        return handler
+
+    def _mark_dirty(self, *args):
+        """Invalidate the cached code of this block and every enclosing block"""
+        self._drag_pixmap = None
+        widget = self
+        while widget is not None:
+            if isinstance(widget, CodeBlock):
+                widget._dirty = True
+            widget = widget.parent()
+
+        # Keep the preview current without regenerating per keystroke
+        main_window = self.get_main_window()
+        if main_window is not None:
+            main_window.schedule_preview()
+
+    def remove_block(self):
+        """Remove this block from the workspace"""
+        # Show confirmation dialog
+        reply = QMessageBox.question(self, "Remove Block", 
+                                    f"Are you sure you want to remove this '{self.block_type}' block?",
+                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        
+        if reply == QMessageBox.No:
+            return
+            
+        # Find if this block is in a workspace
+        workspace = self.get_workspace()
+
+        if workspace:
+            workspace.blocks.pop(id(self), None)
+
+        # Invalidate any enclosing blocks before detaching
+        self._mark_dirty()
+        self.setParent(None)
+        self.deleteLater()
+        
+    def generate_code(self, indent_level=0, include_indent=True):
+        """Generate Python code for this block and its children"""
+        # Clean subtrees return their cached result without re-walking
+        # widgets or children, so regeneration is O(changed blocks)
+        cache_key = (indent_level, include_indent)
+        if not self._dirty:
+            cached = self._code_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        else:
+            self._code_cache.clear()
+
+        if not include_indent:
+            indent = ""
+        elif indent_level < 64:
+            indent = _INDENTS[indent_level]
+        else:
+            indent = "    " * indent_level
+
+        # Fill the precompiled templates from the Python-side value
+        # mirror, avoiding a Qt call per input widget
+        values = _SafeDict(self._input_values)
+        for name, slot in self.input_slots.items():
+            values[name] = slot.get_value()
+
+        # For nested blocks that can output a value, just return the output value
+        if self.is_nested and self.definition.get("output_enabled", False):
+            result = self.definition["_output_tmpl"](values)
+            self._code_cache[cache_key] = result
+            self._dirty = False
+            return result
+
+        code = self.definition["_code_tmpl"](values)
+
+        # For regular blocks, add the code with indentation; child code is
+        # collected in a list and joined once, avoiding quadratic string
+        # concatenation on deep block trees
+        parts = [indent, code, "\n"]
+
+        # Add code for child blocks if applicable
+        if self.definition.get("has_children", False) and not self.is_nested:
+            for child in self.child_blocks:
+                parts.append(child.generate_code(indent_level + 1))
+
+            # Add else section if applicable
+            if self.definition.get("has_else_children", False) and self.definition.get("else_template"):
+                parts.append(indent + self.definition.get("else_template") + "\n")
+
+                for else_child in self.else_blocks:
+                    parts.append(else_child.generate_code(indent_level + 1))
+
+        result = "".join(parts)
+        self._code_cache[cache_key] = result
+        self._dirty = False
+        return result
+        
+    def resizeEvent(self, event):
+        # The cached drag pixmap no longer matches the widget
+        self._drag_pixmap = None
+        super().resizeEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and not self.is_nested:
+            self.drag_start_position = event.pos()
+            self.dragging = True
+            self.setCursor(Qt.ClosedHandCursor)  # Change cursor on click
+            
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and not self.is_nested:
+            self.dragging = False
+            self.setCursor(Qt.OpenHandCursor)  # Restore cursor
+            
+    def mouseMoveEvent(self, event):
+        if not (event.buttons() & Qt.LeftButton) or not self.dragging or self.is_nested:
+            return
+
+        # Mouse moves arrive faster than the frame rate; check for a drag
+        # start at most once per ~16 ms
+        now = time.monotonic_ns()
+        if now - self._last_move_ns < 16_000_000:
+            return
+        self._last_move_ns = now
+
+        # Calculate distance moved
+        if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
+            return
+
+        # For non-nested blocks, create a drag
+        drag = QDrag(self)
+        mime_data = QMimeData()
+        mime_data.setText(self.block_type)
+        drag.setMimeData(mime_data)
+        
+        # Reuse the rendered drag pixmap; _mark_dirty and resizeEvent
+        # drop it whenever the block's appearance can change
+        if self._drag_pixmap is None:
+            self._drag_pixmap = self.grab()
+        drag.setPixmap(self._drag_pixmap)
+        drag.setHotSpot(event.pos())
+
+        # Find if this block is in a workspace
+        workspace = self.get_workspace()
+
+        # Hide in place during the drag instead of reparenting out of the
+        # layout: one cheap visibility change instead of two layout passes
+        if workspace:
+            self.hide()
+
+        # Execute the drag
+        result = drag.exec_(Qt.MoveAction)
+
+        if workspace:
+            if result == Qt.IgnoreAction:
+                # Drag was cancelled, just reveal the block again
+                self.show()
+                self.setCursor(Qt.OpenHandCursor)  # Restore cursor
+            else:
+                # The drop target created its own copy; retire the original
+                workspace.blocks.pop(id(self), None)
+                self._mark_dirty()
+                self.setParent(None)
+                self.deleteLater()
+
+
+class WorkspaceWidget(QWidget):
+    """Workspace where blocks are arranged"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setAcceptDrops(True)
+
+        # The outer layout only ever holds a swappable inner container so
+        # clear() can replace the whole block tree in one operation
+        self._outer = QVBoxLayout(self)
+        self._outer.setContentsMargins(0, 0, 0, 0)
+        self._build_inner()
+
+        # Keyed by id(block) for O(1) removal; dict order preserves the
+        # insertion order code generation relies on
+        self.blocks = {}
+        self._current_style = None
+
+    def _apply_style(self, style):
+        """Set the stylesheet only when it actually changes"""
+        if self._current_style is not style:
+            self._current_style = style
+            self.setStyleSheet(style)
+
+    def _build_inner(self):
+        """Create a fresh inner container that holds the block layout"""
+        self._inner = QWidget(self)
+        self.layout = QVBoxLayout(self._inner)
+        self.layout.setAlignment(Qt.AlignTop)
+        self.layout.setSpacing(10)
+        self.layout.setContentsMargins(20, 20, 20, 20)
+
+        # Add some instruction text
+        instructions = QLabel("Drag blocks from the palette and drop them here")
+        instructions.setAlignment(Qt.AlignCenter)
+        instructions.setStyleSheet("""
+            color: #777;
+            font-style: italic;
+            font-size: 14px;
+            padding: 20px;
+            background-color: rgba(240, 240, 240, 150);
+            border: 1px dashed #aaa;
+            border-radius: 8px;
+        """)
+        self.layout.addWidget(instructions)
+
+        self._outer.addWidget(self._inner)
+        
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasText():
+            self._apply_style(_WORKSPACE_STYLE_DRAGOVER)
+            event.acceptProposedAction()
+
+    def dragLeaveEvent(self, event):
+        self._apply_style(_WORKSPACE_STYLE_IDLE)
+
+    def dropEvent(self, event):
+        # The mime text may carry several newline-separated block types
+        # (multi-select drags); build them all in one repaint window
+        block_types = event.mimeData().text().splitlines()
+
+        self.setUpdatesEnabled(False)
+        try:
+            for block_type in block_types:
+                if not block_type:
+                    continue
+                block = CodeBlock(sys.intern(block_type), self)
+                self.layout.addWidget(block)
+                self.blocks[id(block)] = block
+        finally:
+            self.setUpdatesEnabled(True)
+
+        self._apply_style(_WORKSPACE_STYLE_IDLE)
+
+        # Refresh the preview for the newly dropped block
+        parent = self.parent()
+        while parent is not None and not isinstance(parent, CodeBlockEditor):
+            parent = parent.parent()
+        if parent is not None:
+            parent.schedule_preview()
+
+        event.acceptProposedAction()
+        
+    def clear(self):
+        """Remove all blocks from the workspace"""
+        # Ask for confirmation
+        if self.blocks:
+            reply = QMessageBox.question(self, "Clear Workspace", 
+                                     "Are you sure you want to clear the workspace? All blocks will be deleted.",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                                     
+            if reply == QMessageBox.No:
+                return
+                
+        # Swap out the whole inner container instead of detaching blocks
+        # one at a time; deleting the subtree wholesale is far cheaper for
+        # Qt than removing children from a live layout
+        self._inner.deleteLater()
+        self.blocks.clear()
+        self._build_inner()
+        
+    def generate_code(self):
+        """Generate Python code from all blocks in the workspace"""
+        parts = ["# Generated Python Code\n\n"]
+
+        for block in self.blocks.values():
+            parts.append(block.generate_code())
+
+        return "".join(parts)
+        
+    def to_json(self):
+        """Serialize workspace to JSON"""
+        return {
+            "blocks": [block.to_json() for block in self.blocks.values()]
+        }
+        
+    def from_json(self, data, main_window):
+        """Deserialize workspace from JSON"""
+        self.clear()
+
+        # Suspend repaints while rebuilding so adding N blocks costs one
+        # relayout instead of one per widget
+        self.setUpdatesEnabled(False)
+        try:
+            for block_data in data.get("blocks", []):
+                block_type = block_data.get("type", "")
+                if not block_type:
+                    continue
+
+                # Populate each block before inserting it into the layout so
+                # its subtree is laid out once
+                block = CodeBlock(block_type, self,
+                                  definition=main_window.block_definitions.get(block_type))
+                block.from_json(block_data, main_window)
+                self.layout.addWidget(block)
+                self.blocks[id(block)] = block
+        finally:
+            self.setUpdatesEnabled(True)
+
+
+def main():
+    app = QApplication(sys.argv)
+    app.setStyleSheet(STYLES)
+    window = CodeBlockEditor()
+    window.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,9 +1,18 @@
 import json
 import os
 import logging
+from types import MappingProxyType
+from PyQt5.QtCore import QCoreApplication, QFileSystemWatcher
 from PyQt5.QtGui import QColor
 from typing import Dict, Any, Optional
 
+# orjson parses config blobs several times faster than the stdlib; fall
+# back silently when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -11,13 +20,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger('settings_loader')
 
+# Fallback configuration used when settings files are missing or invalid;
+# built once and shared read-only so the failure path allocates nothing
+_DEFAULT_THEME = MappingProxyType({
+    "background_color": "#f5f5f5",
+    "text_color": "#333333",
+    "accent_color": "#3498db",
+    "success_color": "#2ecc71",
+    "warning_color": "#f39c12",
+    "error_color": "#e74c3c",
+    "highlight_color": "#9b59b6",
+    "panel_color": "#ffffff",
+    "border_color": "#dddddd"
+})
+
+_DEFAULT_DARK_THEME = MappingProxyType({
+    "background_color": "#2c3e50",
+    "text_color": "#ecf0f1",
+    "accent_color": "#3498db",
+    "panel_color": "#34495e",
+    "border_color": "#7f8c8d"
+})
+
+_DEFAULT_APP_SETTINGS = MappingProxyType({
+    "application": {
+        "name": "Python Block Code Editor",
+        "version": "1.0.0"
+    },
+    "ui": {
+        "theme": "light",
+        "themes": {
+            "light": _DEFAULT_THEME,
+            "dark": _DEFAULT_DARK_THEME
+        },
+        "font_family": "Consolas, 'Courier New', monospace",
+        "font_size": 12
+    },
+    "editor": {
+        "indentation_size": 4,
+        "auto_indent": True
+    },
+    "blocks": {
+        "snap_to_grid": True,
+        "grid_size": 10
+    },
+    "execution": {
+        "timeout_seconds": 5,
+        "max_output_lines": 500,
+        "clear_output_on_run": True
+    }
+})
+
 class SettingsLoader:
     """
     Handles loading and management of application settings from JSON configuration files.
     Supports hot-reloading of settings and provides defaults if settings are missing.
     """
-    
-    def __init__(self, 
+
+    # The singleton lives for the whole session, but slots also make
+    # attribute access a C-level descriptor lookup on the hot getters
+    __slots__ = (
+        'app_settings_file', 'block_defs_file', 'block_caps_file',
+        'app_settings', 'block_definitions', 'block_capabilities',
+        'last_modified', '_parsed_cache', '_watcher', '_pending_changes',
+        '_flat', '_nesting_cache', '_theme_qcolors_cache'
+    )
+
+    def __init__(self,
                  app_settings_file: str = 'app_settings.json',
                  block_defs_file: str = 'block_definitions.json',
                  block_caps_file: str = 'block_capabilities.json'):
@@ -44,7 +113,16 @@ class SettingsLoader:
             block_defs_file: 0,
             block_caps_file: 0
         }
-        
+
+        # Parsed JSON keyed by path -> (mtime, data) so reload_all only
+        # re-parses files that actually changed on disk
+        self._parsed_cache = {}
+
+        # Kernel-backed file watcher, created lazily once a Qt application
+        # exists; until then check_for_changes falls back to stat polling
+        self._watcher = None
+        self._pending_changes = set()
+
         # Load all settings
         self.reload_all()
     
@@ -53,6 +131,39 @@ class SettingsLoader:
         self.app_settings = self._load_json_file(self.app_settings_file, self._default_app_settings())
         self.block_definitions = self._load_json_file(self.block_defs_file, {})
         self.block_capabilities = self._load_json_file(self.block_caps_file, {"nesting_rules": {}})
+        self._rebuild_flat()
+
+        # Precompute the frozenset rule pairs for every configured input
+        # so drop validation never touches the raw lists
+        for block_type, block_rules in self.block_capabilities.get("nesting_rules", {}).items():
+            for input_name in block_rules:
+                self._cached_nesting_rules(block_type, input_name)
+
+    def _rebuild_flat(self) -> None:
+        """
+        Rebuild the dotted-key lookup table for app settings.
+
+        Every node (leaves and sub-dictionaries) is stored under its
+        "ui.theme"-style path so get_app_setting is a single dict lookup.
+        """
+        flat = {}
+
+        def _flatten(d: Dict[str, Any], prefix: str) -> None:
+            for key, value in d.items():
+                path = prefix + key
+                flat[path] = value
+                if isinstance(value, dict):
+                    _flatten(value, path + '.')
+
+        _flatten(self.app_settings, '')
+        self._flat = flat
+
+        # Nesting rules as frozensets, keyed by (block_type, input_name);
+        # rebuilt lazily after every reload
+        self._nesting_cache = {}
+
+        # QColor dicts keyed by theme name, rebuilt lazily after reloads
+        self._theme_qcolors_cache = {}
     
     def check_for_changes(self) -> bool:
         """
@@ -61,21 +172,56 @@ class SettingsLoader:
         Returns:
             bool: True if any files have changed, False otherwise
         """
-        changed = False
-        
-        for file_path in self.last_modified:
-            if os.path.exists(file_path):
-                current_mtime = os.path.getmtime(file_path)
-                if current_mtime > self.last_modified[file_path]:
-                    self.last_modified[file_path] = current_mtime
-                    changed = True
-        
+        if self._ensure_watcher():
+            # Event-driven path: the watcher already recorded any changes,
+            # so no stat syscalls are needed here
+            changed = bool(self._pending_changes)
+            self._pending_changes.clear()
+        else:
+            changed = False
+
+            for file_path in self.last_modified:
+                if os.path.exists(file_path):
+                    current_mtime = os.path.getmtime(file_path)
+                    if current_mtime > self.last_modified[file_path]:
+                        self.last_modified[file_path] = current_mtime
+                        changed = True
+
         if changed:
             self.reload_all()
             logger.info("Settings reloaded due to file changes")
-        
+
         return changed
-    
+
+    def _ensure_watcher(self) -> bool:
+        """
+        Create the QFileSystemWatcher once a Qt application exists.
+
+        Returns:
+            True if the watcher is active, False if the caller should fall
+            back to stat polling (including the creation call itself, so
+            edits made before watching began are still picked up once)
+        """
+        if self._watcher is not None:
+            return True
+
+        if QCoreApplication.instance() is None:
+            return False
+
+        paths = [path for path in self.last_modified if os.path.exists(path)]
+        self._watcher = QFileSystemWatcher(paths)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        return False
+
+    def _on_file_changed(self, path: str) -> None:
+        """Record a changed file reported by the watcher."""
+        self._pending_changes.add(path)
+
+        # Editors often replace files on save; re-add the path so the
+        # watch survives the inode swap
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
     def get_app_setting(self, *keys: str, default: Any = None) -> Any:
         """
         Retrieve an application setting by navigating through nested dictionaries.
@@ -87,8 +233,48 @@ class SettingsLoader:
         Returns:
             The requested setting value or the default if not found
         """
-        return self._get_nested_setting(self.app_settings, keys, default)
-    
+        return self._flat.get('.'.join(keys), default)
+
+    def set_app_setting(self, *args: Any) -> None:
+        """
+        Set an application setting, keeping the dotted-key lookup table
+        in sync with the nested dictionaries.
+
+        Args:
+            *args: A sequence of keys to navigate the nested
+                dictionaries, followed by the value to store
+        """
+        keys = args[:-1]
+        value = args[-1]
+
+        # Write the nested dict, creating intermediate levels (and
+        # their flat entries) as needed
+        node = self.app_settings
+        prefix = ''
+        for key in keys[:-1]:
+            path = prefix + key
+            child = node.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                node[key] = child
+                self._flat[path] = child
+            node = child
+            prefix = path + '.'
+        node[keys[-1]] = value
+
+        # Mirror the leaf (and any dict descendants) into the flat table
+        leaf_path = prefix + keys[-1]
+        self._flat[leaf_path] = value
+        if isinstance(value, dict):
+            stack = [(leaf_path + '.', value)]
+            while stack:
+                sub_prefix, sub = stack.pop()
+                for sub_key, sub_value in sub.items():
+                    sub_path = sub_prefix + sub_key
+                    self._flat[sub_path] = sub_value
+                    if isinstance(sub_value, dict):
+                        stack.append((sub_path + '.', sub_value))
+
     def get_block_definition(self, block_type: str) -> Optional[Dict[str, Any]]:
         """
         Get the definition for a specific block type.
@@ -119,15 +305,12 @@ class SettingsLoader:
             input_name: The name of the input slot
             
         Returns:
-            Dictionary with 'allowed' and 'denied' lists of block types
+            Dictionary with 'allowed' and 'denied' frozensets of block types
         """
-        rules = self.block_capabilities.get("nesting_rules", {})
-        block_rules = rules.get(block_type, {})
-        input_rules = block_rules.get(input_name, {})
-        
+        allowed, denied = self._cached_nesting_rules(block_type, input_name)
         return {
-            "allowed": input_rules.get("allowed", []),
-            "denied": input_rules.get("denied", [])
+            "allowed": allowed,
+            "denied": denied
         }
     
     def is_nesting_allowed(self, parent_block_type: str, parent_input: str, child_block_type: str) -> bool:
@@ -142,17 +325,34 @@ class SettingsLoader:
         Returns:
             True if nesting is allowed, False otherwise
         """
-        rules = self.get_nesting_rules(parent_block_type, parent_input)
-        
+        allowed, denied = self._cached_nesting_rules(parent_block_type, parent_input)
+
         # If the child block type is explicitly denied, return False
-        if child_block_type in rules["denied"]:
+        if child_block_type in denied:
             return False
-        
-        # If the allowed list is empty (anything allowed) or contains the child block type, return True
-        if not rules["allowed"] or child_block_type in rules["allowed"]:
-            return True
-            
-        return False
+
+        # If the allowed set is empty (anything allowed) or contains the child block type, return True
+        return not allowed or child_block_type in allowed
+
+    def _cached_nesting_rules(self, block_type: str, input_name: str) -> tuple:
+        """
+        Get the nesting rules for a block input as a pair of frozensets.
+
+        Cached per (block_type, input_name) so the drop-check hot path
+        does O(1) set membership instead of re-walking the capabilities
+        dictionary and scanning lists.
+        """
+        key = (block_type, input_name)
+        cached = self._nesting_cache.get(key)
+        if cached is None:
+            rules = self.block_capabilities.get("nesting_rules", {})
+            input_rules = rules.get(block_type, {}).get(input_name, {})
+            cached = (
+                frozenset(input_rules.get("allowed", [])),
+                frozenset(input_rules.get("denied", []))
+            )
+            self._nesting_cache[key] = cached
+        return cached
     
     def get_current_theme(self) -> Dict[str, str]:
         """
@@ -161,10 +361,33 @@ class SettingsLoader:
         Returns:
             Dictionary containing theme color and style settings
         """
-        theme_name = self.get_app_setting("ui", "theme", default="light")
-        themes = self.get_app_setting("ui", "themes", default={})
-        
+        # Read from the live dict rather than the flat table so direct
+        # theme switches (e.g. toggle_theme) take effect immediately
+        ui = self.app_settings.get("ui", {})
+        theme_name = ui.get("theme", "light")
+        themes = ui.get("themes", {})
+
         return themes.get(theme_name, self._default_theme())
+
+    def get_current_theme_qcolors(self) -> Dict[str, QColor]:
+        """
+        Get the current theme colors as ready-made QColor objects.
+
+        Cached per theme name so paint paths never re-parse hex strings.
+
+        Returns:
+            Dictionary mapping theme keys to QColor instances
+        """
+        theme_name = self.app_settings.get("ui", {}).get("theme", "light")
+        cached = self._theme_qcolors_cache.get(theme_name)
+        if cached is None:
+            cached = {
+                key: QColor(value)
+                for key, value in self.get_current_theme().items()
+                if isinstance(value, str)
+            }
+            self._theme_qcolors_cache[theme_name] = cached
+        return cached
     
     def _load_json_file(self, file_path: str, default: Any = None) -> Any:
         """
@@ -179,101 +402,70 @@ class SettingsLoader:
         """
         try:
             if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.last_modified[file_path] = os.path.getmtime(file_path)
+                mtime = os.path.getmtime(file_path)
+                cached = self._parsed_cache.get(file_path)
+                if cached is not None and cached[0] == mtime:
+                    return cached[1]
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                self._parsed_cache[file_path] = (mtime, data)
+                self.last_modified[file_path] = mtime
                 return data
             else:
                 logger.warning(f"Settings file not found: {file_path}")
                 return default if default is not None else {}
-        except json.JSONDecodeError:
+        except ValueError:
             logger.error(f"Invalid JSON in settings file: {file_path}")
             return default if default is not None else {}
         except Exception as e:
             logger.error(f"Error loading settings file {file_path}: {str(e)}")
             return default if default is not None else {}
     
-    def _get_nested_setting(self, settings_dict: Dict[str, Any], keys: tuple, default: Any = None) -> Any:
-        """
-        Navigate through nested dictionary to find a specific setting.
-        
-        Args:
-            settings_dict: Dictionary to navigate
-            keys: Tuple of keys forming the path to the desired setting
-            default: Default value to return if setting not found
-            
-        Returns:
-            The setting value or default if not found
-        """
-        current = settings_dict
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return default
-        return current
-    
     def _default_app_settings(self) -> Dict[str, Any]:
         """
         Provide default application settings in case the settings file is missing.
         
         Returns:
-            Dictionary of default application settings
+            Read-only dictionary of default application settings
         """
-        return {
-            "application": {
-                "name": "Python Block Code Editor",
-                "version": "1.0.0"
-            },
-            "ui": {
-                "theme": "light",
-                "themes": {
-                    "light": self._default_theme(),
-                    "dark": {
-                        "background_color": "#2c3e50",
-                        "text_color": "#ecf0f1",
-                        "accent_color": "#3498db",
-                        "panel_color": "#34495e",
-                        "border_color": "#7f8c8d"
-                    }
-                },
-                "font_family": "Consolas, 'Courier New', monospace",
-                "font_size": 12
-            },
-            "editor": {
-                "indentation_size": 4,
-                "auto_indent": True
-            },
-            "blocks": {
-                "snap_to_grid": True,
-                "grid_size": 10
-            },
-            "execution": {
-                "timeout_seconds": 5,
-                "max_output_lines": 500,
-                "clear_output_on_run": True
-            }
-        }
-    
+        return _DEFAULT_APP_SETTINGS
+
     def _default_theme(self) -> Dict[str, str]:
         """
         Provide default theme colors.
-        
+
         Returns:
-            Dictionary of default theme colors
+            Read-only dictionary of default theme colors
         """
-        return {
-            "background_color": "#f5f5f5",
-            "text_color": "#333333",
-            "accent_color": "#3498db",
-            "success_color": "#2ecc71",
-            "warning_color": "#f39c12",
-            "error_color": "#e74c3c",
-            "highlight_color": "#9b59b6",
-            "panel_color": "#ffffff",
-            "border_color": "#dddddd"
-        }
+        return _DEFAULT_THEME
+
+
+class _LazySettings:
+    """
+    Lazy stand-in for the SettingsLoader singleton.
+
+    Construction (and the three JSON loads it performs) is deferred to
+    the first attribute access, so importing this module stays cheap for
+    entry points that never touch settings.
+    """
+    _instance = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+
+def get_settings() -> SettingsLoader:
+    """
+    Get the shared SettingsLoader, constructing it on first call.
+
+    Tests can reset _LazySettings._instance to None for isolation.
+    """
+    instance = _LazySettings._instance
+    if instance is None:
+        instance = _LazySettings._instance = SettingsLoader()
+    return instance
 
 
-# Create a singleton instance
-settings = SettingsLoader() 
\ No newline at end of file
+# Create a singleton instance, loaded on first use
+settings = _LazySettings() 
\ No newline at end of file
@@ -1,620 +1,601 @@
-import json
-import os
-import logging
-import re
-from typing import Dict, List, Any, Optional, Tuple, Union, Callable
-from PyQt5.QtGui import QColor
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger('utils')
-
-# Try to import numpy for ML features, with fallback to stub implementation
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
-    logger.warning("NumPy not available. Code suggestion features will be limited.")
-
-def hex_to_rgba(hex_color: str, alpha: float = 1.0) -> str:
-    """
-    Convert hex color to rgba string.
-    
-    Args:
-        hex_color: Hex color code (e.g., '#3498db')
-        alpha: Alpha value (0-1)
-        
-    Returns:
-        rgba string (e.g., 'rgba(52, 152, 219, 1.0)')
-    """
-    hex_color = hex_color.lstrip('#')
-    if len(hex_color) == 3:
-        hex_color = ''.join([c*2 for c in hex_color])
-    
-    r, g, b = [int(hex_color[i:i+2], 16) for i in (0, 2, 4)]
-    return f"rgba({r}, {g}, {b}, {alpha})"
-
-def load_json_file(file_path: str, default: Any = None) -> Any:
-    """
-    Load a JSON file with error handling.
-    
-    Args:
-        file_path: Path to the JSON file
-        default: Default value to return if loading fails
-        
-    Returns:
-        The parsed JSON data or the default value if loading fails
-    """
-    try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            logger.warning(f"File not found: {file_path}")
-            return default if default is not None else {}
-    except json.JSONDecodeError:
-        logger.error(f"Invalid JSON in file: {file_path}")
-        return default if default is not None else {}
-    except Exception as e:
-        logger.error(f"Error loading file {file_path}: {e}")
-        return default if default is not None else {}
-
-def save_json_file(file_path: str, data: Any, indent: int = 2) -> bool:
-    """
-    Save data to a JSON file with error handling.
-    
-    Args:
-        file_path: Path to save the JSON file
-        data: Data to save
-        indent: Indentation level for the JSON file
-        
-    Returns:
-        True if successful, False otherwise
-    """
-    try:
-        # Ensure directory exists
-        directory = os.path.dirname(file_path)
-        if directory:
-            ensure_directory_exists(directory)
-        
-        # Write the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent)
-        return True
-    except Exception as e:
-        logger.error(f"Error saving file {file_path}: {e}")
-        return False
-
-def ensure_directory_exists(directory_path: str) -> bool:
-    """
-    Check if a directory exists and create it if it doesn't.
-    
-    Args:
-        directory_path: Path to the directory
-        
-    Returns:
-        True if the directory exists or was created, False otherwise
-    """
-    try:
-        if not os.path.exists(directory_path):
-            os.makedirs(directory_path)
-            logger.info(f"Created directory: {directory_path}")
-        return True
-    except Exception as e:
-        logger.error(f"Error creating directory {directory_path}: {e}")
-        return False
-
-def color_with_brightness(color: str, brightness_factor: float) -> str:
-    """
-    Adjust the brightness of a color.
-    
-    Args:
-        color: Hex color code (e.g., '#3498db')
-        brightness_factor: Factor to adjust brightness (>1 for lighter, <1 for darker)
-        
-    Returns:
-        Adjusted hex color code
-    """
-    if not color.startswith('#'):
-        return color
-    
-    # Remove leading #
-    hex_color = color.lstrip('#')
-    
-    # Expand shorthand (e.g., #abc to #aabbcc)
-    if len(hex_color) == 3:
-        hex_color = ''.join([c*2 for c in hex_color])
-    
-    # Convert to RGB
-    r, g, b = [int(hex_color[i:i+2], 16) for i in (0, 2, 4)]
-    
-    # Adjust brightness
-    r = max(0, min(255, int(r * brightness_factor)))
-    g = max(0, min(255, int(g * brightness_factor)))
-    b = max(0, min(255, int(b * brightness_factor)))
-    
-    # Convert back to hex
-    return f"#{r:02x}{g:02x}{b:02x}"
-
-def format_code(code: str, indent_size: int = 4) -> str:
-    """
-    Format Python code with proper indentation.
-    
-    Args:
-        code: Python code to format
-        indent_size: Number of spaces per indentation level
-        
-    Returns:
-        Formatted Python code
-    """
-    lines = code.split('\n')
-    result = []
-    indent_level = 0
-    
-    for line in lines:
-        # Strip leading/trailing whitespace
-        stripped = line.strip()
-        
-        # Skip empty lines
-        if not stripped:
-            result.append('')
-            continue
-        
-        # Check for dedent before processing the line
-        if (stripped.startswith('elif ') or 
-            stripped.startswith('else:') or 
-            stripped.startswith('except') or 
-            stripped.startswith('finally:') or 
-            stripped == 'pass'):
-            indent_level = max(0, indent_level - 1)
-        
-        # Add indentation
-        indentation = ' ' * indent_size * indent_level
-        result.append(indentation + stripped)
-        
-        # Check for indent after processing the line
-        if (stripped.endswith(':') and not stripped.startswith('#')):
-            if not (stripped.startswith('class ') and ' def ' in stripped):  # Skip one-line method definitions
-                indent_level += 1
-        
-        # Check for specific dedent keywords
-        if stripped.startswith('return ') or stripped == 'return' or stripped.startswith('break') or stripped.startswith('continue'):
-            indent_level = max(0, indent_level - 1)
-    
-    return '\n'.join(result)
-
-class CodeSuggestionModel:
-    """
-    Simple machine learning model for code suggestions based on n-grams.
-    
-    This model analyzes code patterns and suggests completions for code blocks.
-    It uses a probabilistic approach based on token sequences seen during training.
-    """
-    def __init__(self, n_gram_size: int = 3):
-        """
-        Initialize the code suggestion model.
-        
-        Args:
-            n_gram_size: Size of the n-grams to use for analysis
-        """
-        self.n_gram_size = n_gram_size
-        self.transitions = {}  # Maps n-grams to possible next tokens
-        self.token_counts = {}  # Frequency of each token
-        self.total_tokens = 0
-        
-        # Initialize numpy arrays if available
-        if NUMPY_AVAILABLE:
-            self.transition_probs = {}
-    
-    def tokenize(self, code: str) -> List[str]:
-        """
-        Tokenize Python code into a list of tokens.
-        
-        Args:
-            code: Python code to tokenize
-            
-        Returns:
-            List of tokens
-        """
-        # Simple tokenization by whitespace and operators
-        # In a real implementation, we would use a proper Python tokenizer
-        code = code.replace('\n', ' <NEWLINE> ')
-        code = code.replace(':', ' : ')
-        code = code.replace('(', ' ( ')
-        code = code.replace(')', ' ) ')
-        code = code.replace('[', ' [ ')
-        code = code.replace(']', ' ] ')
-        code = code.replace('{', ' { ')
-        code = code.replace('}', ' } ')
-        code = code.replace(',', ' , ')
-        code = code.replace('.', ' . ')
-        code = code.replace('=', ' = ')
-        code = code.replace('==', ' == ')
-        code = code.replace('!=', ' != ')
-        code = code.replace('>', ' > ')
-        code = code.replace('<', ' < ')
-        code = code.replace('>=', ' >= ')
-        code = code.replace('<=', ' <= ')
-        code = code.replace('+', ' + ')
-        code = code.replace('-', ' - ')
-        code = code.replace('*', ' * ')
-        code = code.replace('/', ' / ')
-        
-        # Split by whitespace and filter out empty tokens
-        tokens = [token for token in code.split() if token]
-        
-        return tokens
-    
-    def train(self, code_samples: List[str]) -> None:
-        """
-        Train the model on a list of code samples.
-        
-        Args:
-            code_samples: List of Python code strings
-        """
-        for code in code_samples:
-            tokens = self.tokenize(code)
-            
-            # Count token frequencies
-            for token in tokens:
-                self.token_counts[token] = self.token_counts.get(token, 0) + 1
-                self.total_tokens += 1
-            
-            # Build n-gram transitions
-            for i in range(len(tokens) - self.n_gram_size):
-                n_gram = tuple(tokens[i:i+self.n_gram_size])
-                next_token = tokens[i+self.n_gram_size]
-                
-                if n_gram not in self.transitions:
-                    self.transitions[n_gram] = {}
-                
-                self.transitions[n_gram][next_token] = self.transitions[n_gram].get(next_token, 0) + 1
-        
-        # Calculate transition probabilities
-        if NUMPY_AVAILABLE:
-            for n_gram, next_tokens in self.transitions.items():
-                total = sum(next_tokens.values())
-                self.transition_probs[n_gram] = {
-                    token: count / total for token, count in next_tokens.items()
-                }
-    
-    def suggest(self, context: str, max_suggestions: int = 3) -> List[Tuple[str, float]]:
-        """
-        Generate suggestions for code completion based on the context.
-        
-        Args:
-            context: Current code context
-            max_suggestions: Maximum number of suggestions to return
-            
-        Returns:
-            List of (suggestion, probability) tuples
-        """
-        # Tokenize the context
-        context_tokens = self.tokenize(context)
-        
-        # If we don't have enough context tokens, return the most common tokens
-        if len(context_tokens) < self.n_gram_size:
-            if not self.token_counts:
-                return []
-                
-            # Return the most common tokens
-            top_tokens = sorted(self.token_counts.items(), key=lambda x: x[1], reverse=True)[:max_suggestions]
-            return [(token, count / self.total_tokens) for token, count in top_tokens]
-        
-        # Get the most recent n-gram
-        recent_n_gram = tuple(context_tokens[-self.n_gram_size:])
-        
-        # If we haven't seen this n-gram, return the most common tokens
-        if recent_n_gram not in self.transitions:
-            if not self.token_counts:
-                return []
-                
-            # Return the most common tokens
-            top_tokens = sorted(self.token_counts.items(), key=lambda x: x[1], reverse=True)[:max_suggestions]
-            return [(token, count / self.total_tokens) for token, count in top_tokens]
-        
-        # Get the next token suggestions based on transition probabilities
-        next_tokens = self.transitions[recent_n_gram]
-        suggestions = sorted(next_tokens.items(), key=lambda x: x[1], reverse=True)[:max_suggestions]
-        
-        # Calculate probabilities
-        total = sum(next_tokens.values())
-        return [(token, count / total) for token, count in suggestions]
-    
-    def save(self, file_path: str) -> bool:
-        """
-        Save the model to a file.
-        
-        Args:
-            file_path: Path to save the model
-            
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            model_data = {
-                "n_gram_size": self.n_gram_size,
-                "transitions": {
-                    # Convert tuple keys to strings for JSON
-                    ','.join(n_gram): next_tokens
-                    for n_gram, next_tokens in self.transitions.items()
-                },
-                "token_counts": self.token_counts,
-                "total_tokens": self.total_tokens
-            }
-            
-            return save_json_file(file_path, model_data)
-        except Exception as e:
-            logger.error(f"Error saving model to {file_path}: {e}")
-            return False
-    
-    @classmethod
-    def load(cls, file_path: str) -> Optional['CodeSuggestionModel']:
-        """
-        Load the model from a file.
-        
-        Args:
-            file_path: Path to load the model from
-            
-        Returns:
-            The loaded model or None if loading failed
-        """
-        try:
-            model_data = load_json_file(file_path)
-            if not model_data:
-                return None
-            
-            # Create a new model instance
-            model = cls(n_gram_size=model_data.get("n_gram_size", 3))
-            
-            # Load transitions
-            model.transitions = {
-                # Convert string keys back to tuples
-                tuple(n_gram.split(',')): next_tokens
-                for n_gram, next_tokens in model_data.get("transitions", {}).items()
-            }
-            
-            # Load token counts
-            model.token_counts = model_data.get("token_counts", {})
-            model.total_tokens = model_data.get("total_tokens", 0)
-            
-            # Calculate transition probabilities if numpy is available
-            if NUMPY_AVAILABLE:
-                for n_gram, next_tokens in model.transitions.items():
-                    total = sum(next_tokens.values())
-                    model.transition_probs[n_gram] = {
-                        token: count / total for token, count in next_tokens.items()
-                    }
-            
-            return model
-        except Exception as e:
-            logger.error(f"Error loading model from {file_path}: {e}")
-            return None
-
-try:
-    import numpy as np
-    
-    # Only define ML functions if numpy is available
-    class CodeSuggestionModel:
-        """A simple code suggestion model using n-gram analysis"""
-        def __init__(self, n=3):
-            self.n = n
-            self.transitions = {}
-            self.start_tokens = {}
-            
-        def train(self, code_samples):
-            """Train the model on a list of code samples"""
-            for code in code_samples:
-                tokens = self._tokenize(code)
-                if len(tokens) < self.n:
-                    continue
-                    
-                # Record starting n-grams
-                start_key = ' '.join(tokens[:self.n-1])
-                self.start_tokens[start_key] = self.start_tokens.get(start_key, 0) + 1
-                
-                # Record transitions
-                for i in range(len(tokens) - self.n + 1):
-                    context = ' '.join(tokens[i:i+self.n-1])
-                    next_token = tokens[i+self.n-1]
-                    
-                    if context not in self.transitions:
-                        self.transitions[context] = {}
-                    
-                    self.transitions[context][next_token] = self.transitions[context].get(next_token, 0) + 1
-                    
-        def _tokenize(self, code):
-            """Simple tokenization for Python code"""
-            import re
-            # Replace newlines with space
-            code = code.replace('\n', ' ')
-            # Add spaces around punctuation
-            code = re.sub(r'([^\w\s])', r' \1 ', code)
-            # Remove extra whitespace
-            code = re.sub(r'\s+', ' ', code).strip()
-            return code.split()
-            
-        def suggest_completion(self, context, max_length=10):
-            """Suggest completion for given context"""
-            tokens = self._tokenize(context)
-            if len(tokens) < self.n - 1:
-                return ""
-                
-            # Get the last n-1 tokens as context
-            context_key = ' '.join(tokens[-(self.n-1):])
-            
-            # If we have no transitions for this context, return empty
-            if context_key not in self.transitions:
-                return ""
-                
-            # Choose next token based on frequency
-            candidates = self.transitions[context_key]
-            next_token = max(candidates.items(), key=lambda x: x[1])[0]
-            
-            # Generate rest of suggestion
-            suggestion = [next_token]
-            for _ in range(max_length - 1):
-                # Update context
-                context_tokens = tokens[-(self.n-2):] + suggestion
-                context_key = ' '.join(context_tokens[-(self.n-1):])
-                
-                if context_key not in self.transitions:
-                    break
-                    
-                # Choose next token
-                candidates = self.transitions[context_key]
-                next_token = max(candidates.items(), key=lambda x: x[1])[0]
-                suggestion.append(next_token)
-                
-            return ' '.join(suggestion)
-            
-    def load_code_model():
-        """Load or create a code suggestion model"""
-        model_file = 'code_model.json'
-        model = CodeSuggestionModel()
-        
-        # Try to load existing model
-        data = load_json_file(model_file)
-        if data:
-            model.transitions = data.get('transitions', {})
-            model.start_tokens = data.get('start_tokens', {})
-            model.n = data.get('n', 3)
-        
-        return model
-        
-    def save_code_model(model):
-        """Save the code suggestion model"""
-        model_file = 'code_model.json'
-        data = {
-            'transitions': model.transitions,
-            'start_tokens': model.start_tokens,
-            'n': model.n
-        }
-        save_json_file(model_file, data)
-        
-except ImportError:
-    logger.warning("NumPy not available, machine learning features will be disabled")
-    
-    # Provide stub implementations
-    class CodeSuggestionModel:
-        def __init__(self, n=3):
-            self.n = n
-            
-        def train(self, code_samples):
-            pass
-            
-        def suggest_completion(self, context, max_length=10):
-            return ""
-            
-    def load_code_model():
-        return CodeSuggestionModel()
-        
-    def save_code_model(model):
-        pass
-
-class DotDict(dict):
-    """
-    A dictionary that allows dot notation access to its items.
-    This makes template formatting cleaner in the generate_code method.
-    """
-    def __getattr__(self, key):
-        try:
-            return self[key]
-        except KeyError:
-            return ""
-
-    def __setattr__(self, key, value):
-        self[key] = value
-
-    def __delattr__(self, key):
-        try:
-            del self[key]
-        except KeyError:
-            pass
-
-def format_error_message(error: Exception, block_type: str = "") -> str:
-    """
-    Format an error message for display to the user.
-    
-    Args:
-        error: The exception that occurred
-        block_type: The type of block where the error occurred
-        
-    Returns:
-        A formatted error message string
-    """
-    prefix = f"Error in {block_type}: " if block_type else "Error: "
-    return f"{prefix}{str(error)}"
-
-def safely_format_template(template: str, context: dict) -> str:
-    """
-    Safely format a template string with a context dictionary.
-    
-    Args:
-        template: The template string to format
-        context: The context dictionary with values
-        
-    Returns:
-        The formatted string or an error message
-    """
-    try:
-        return template.format(**context)
-    except Exception as e:
-        logger.error(f"Error formatting template: {str(e)}")
-        return f"# Error formatting template: {str(e)}"
-
-def is_variable_reference(value: str) -> bool:
-    """
-    Check if a string looks like a variable reference.
-    
-    Args:
-        value: The string to check
-        
-    Returns:
-        True if the string looks like a variable reference
-    """
-    if not value:
-        return False
-        
-    # Check if it has quotes (string literal)
-    if value.startswith('"') or value.startswith("'"):
-        return False
-        
-    # Check if it's a digit (number literal)
-    if value.isdigit():
-        return False
-        
-    # Check for expressions with operators
-    operators = ['+', '-', '*', '/', '(', ')', '[', ']', '{', '}']
-    if any(op in value for op in operators):
-        return False
-        
-    # Check for valid variable naming pattern (allowing underscores)
-    return value.isalnum() or '_' in value
-
-def apply_safe_quote_rules(value: str, data_type: str = "string") -> str:
-    """
-    Apply quoting rules to a value based on its context and type.
-    
-    Args:
-        value: The value to potentially quote
-        data_type: The expected data type
-        
-    Returns:
-        The value, potentially with quotes added
-    """
-    # If already quoted, keep as is
-    if value.startswith('"') or value.startswith("'"):
-        return value
-        
-    # For string type, check if this is a variable reference
-    if data_type == "string":
-        if is_variable_reference(value):
-            return value
-        else:
-            # Add quotes for strings that aren't variable references
-            return f'"{value}"'
-    
-    # For other types, don't add quotes
+import importlib.util
+import io
+import json
+import mmap
+import os
+import logging
+import pickle
+import re
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable
+from PyQt5.QtGui import QColor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('utils')
+
+# orjson encodes/decodes several times faster than the stdlib; fall back
+# silently when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The suggestion model is pure Python now, so numpy is never imported
+# eagerly; find_spec only checks availability without paying the import
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Tokenizer pattern, compiled once per process: matches words/numbers,
+# multi-char comparison operators (before their single-char prefixes can
+# split them), newlines and single-char punctuation in one pass.
+_TOKEN_RE = re.compile(r"\w+|==|!=|>=|<=|\n|[()\[\]{},.:=+\-*/<>]")
+
+# Quoting helpers: one scan for expression operators and one strict
+# identifier match, bound to their fast methods
+_OPERATOR_SEARCH = re.compile(r"[+\-*/()\[\]{}]").search
+_IDENT_MATCH = re.compile(r"\A[A-Za-z_]\w*\Z").match
+
+# format_code patterns: keywords that dedent before the line, keywords
+# that dedent after it, and block-opening lines ending with a colon
+_DEDENT_BEFORE_MATCH = re.compile(r"elif |else:|except|finally:|pass$").match
+_DEDENT_AFTER_MATCH = re.compile(r"return\b|break\b|continue\b").match
+_OPENS_BLOCK_SEARCH = re.compile(r":$").search
+
+def hex_to_rgba(hex_color: str, alpha: float = 1.0) -> str:
+    """
+    Convert hex color to rgba string.
+    
+    Args:
+        hex_color: Hex color code (e.g., '#3498db')
+        alpha: Alpha value (0-1)
+        
+    Returns:
+        rgba string (e.g., 'rgba(52, 152, 219, 1.0)')
+    """
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = ''.join([c*2 for c in hex_color])
+
+    # One base-16 parse and shifts instead of three substring parses
+    value = int(hex_color, 16)
+    return f"rgba({(value >> 16) & 0xFF}, {(value >> 8) & 0xFF}, {value & 0xFF}, {alpha})"
+
+def load_json_file(file_path: str, default: Any = None) -> Any:
+    """
+    Load a JSON file with error handling.
+    
+    Args:
+        file_path: Path to the JSON file
+        default: Default value to return if loading fails
+        
+    Returns:
+        The parsed JSON data or the default value if loading fails
+    """
+    try:
+        if os.path.exists(file_path):
+            if orjson is not None and os.path.getsize(file_path) > (1 << 20):
+                # Parse big files straight out of the page cache instead
+                # of copying them into a Python bytes object first
+                with open(file_path, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # orjson takes a memoryview, not the mmap itself;
+                        # release it before the mapping closes
+                        view = memoryview(mm)
+                        try:
+                            return orjson.loads(view)
+                        finally:
+                            view.release()
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        else:
+            logger.warning(f"File not found: {file_path}")
+            return default if default is not None else {}
+    except ValueError:
+        logger.error(f"Invalid JSON in file: {file_path}")
+        return default if default is not None else {}
+    except Exception as e:
+        logger.error(f"Error loading file {file_path}: {e}")
+        return default if default is not None else {}
+
+def save_json_file(file_path: str, data: Any, indent: int = 2) -> bool:
+    """
+    Save data to a JSON file with error handling.
+    
+    Args:
+        file_path: Path to save the JSON file
+        data: Data to save
+        indent: Indentation level for the JSON file
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        # Ensure directory exists
+        directory = os.path.dirname(file_path)
+        if directory:
+            ensure_directory_exists(directory)
+        
+        # Write the file
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if indent else 0
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=indent)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving file {file_path}: {e}")
+        return False
+
+# Directories already created or confirmed this session; repeated saves
+# into the same place skip the syscall entirely
+_ENSURED_DIRS = set()
+
+def ensure_directory_exists(directory_path: str) -> bool:
+    """
+    Check if a directory exists and create it if it doesn't.
+    
+    Args:
+        directory_path: Path to the directory
+        
+    Returns:
+        True if the directory exists or was created, False otherwise
+    """
+    if directory_path in _ENSURED_DIRS:
+        return True
+
+    try:
+        # exist_ok collapses the old exists-then-create pair into one call
+        os.makedirs(directory_path, exist_ok=True)
+        _ENSURED_DIRS.add(directory_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error creating directory {directory_path}: {e}")
+        return False
+
+def color_with_brightness(color: str, brightness_factor: float) -> str:
+    """
+    Adjust the brightness of a color.
+    
+    Args:
+        color: Hex color code (e.g., '#3498db')
+        brightness_factor: Factor to adjust brightness (>1 for lighter, <1 for darker)
+        
+    Returns:
+        Adjusted hex color code
+    """
+    if not color.startswith('#'):
+        return color
+    
+    # Remove leading #
+    hex_color = color.lstrip('#')
+    
+    # Expand shorthand (e.g., #abc to #aabbcc)
+    if len(hex_color) == 3:
+        hex_color = ''.join([c*2 for c in hex_color])
+    
+    # Convert to RGB with one parse and shifts
+    value = int(hex_color, 16)
+    r = (value >> 16) & 0xFF
+    g = (value >> 8) & 0xFF
+    b = value & 0xFF
+
+    # Adjust brightness; factors are non-negative by contract, so only
+    # the upper clamp is needed
+    r = min(255, int(r * brightness_factor))
+    g = min(255, int(g * brightness_factor))
+    b = min(255, int(b * brightness_factor))
+
+    # Convert back to hex, packed as one int
+    return f"#{r << 16 | g << 8 | b:06x}"
+
+def format_code(code: str, indent_size: int = 4) -> str:
+    """
+    Format Python code with proper indentation.
+    
+    Args:
+        code: Python code to format
+        indent_size: Number of spaces per indentation level
+        
+    Returns:
+        Formatted Python code
+    """
+    lines = code.split('\n')
+    buf = io.StringIO()
+    indent_level = 0
+
+    # Indent strings reused across lines, grown on demand
+    indents = ['']
+
+    for line in lines:
+        # Strip leading/trailing whitespace
+        stripped = line.strip()
+
+        # Skip empty lines
+        if not stripped:
+            buf.write('\n')
+            continue
+
+        # Check for dedent before processing the line
+        if _DEDENT_BEFORE_MATCH(stripped):
+            indent_level = max(0, indent_level - 1)
+
+        # Write indentation and content separately; no per-line concat
+        while indent_level >= len(indents):
+            indents.append(' ' * indent_size * len(indents))
+        buf.write(indents[indent_level])
+        buf.write(stripped)
+        buf.write('\n')
+
+        # Check for indent after processing the line
+        if _OPENS_BLOCK_SEARCH(stripped) and not stripped.startswith('#'):
+            if not (stripped.startswith('class ') and ' def ' in stripped):  # Skip one-line method definitions
+                indent_level += 1
+
+        # Check for specific dedent keywords
+        if _DEDENT_AFTER_MATCH(stripped):
+            indent_level = max(0, indent_level - 1)
+
+    # Every line wrote a trailing newline; drop the final one to match
+    # the join-based output
+    return buf.getvalue()[:-1]
+
+class CodeSuggestionModel:
+    """
+    Simple machine learning model for code suggestions based on n-grams.
+    
+    This model analyzes code patterns and suggests completions for code blocks.
+    It uses a probabilistic approach based on token sequences seen during training.
+    """
+    def __init__(self, n_gram_size: int = 3):
+        """
+        Initialize the code suggestion model.
+        
+        Args:
+            n_gram_size: Size of the n-grams to use for analysis
+        """
+        self.n_gram_size = n_gram_size
+        self.transitions = defaultdict(Counter)  # Maps n-grams to next-token counts
+        self.token_counts = Counter()  # Frequency of each token
+        self.total_tokens = 0
+        self.transition_totals = {}  # Count sum per n-gram, the denominator in suggest
+        self._top_tokens = []  # Precomputed head of token_counts for the no-context branch
+    
+    def tokenize(self, code: str) -> List[str]:
+        """
+        Tokenize Python code into a list of tokens.
+        
+        Args:
+            code: Python code to tokenize
+            
+        Returns:
+            List of tokens
+        """
+        # Simple tokenization by whitespace and operators
+        # In a real implementation, we would use a proper Python tokenizer.
+        # A single regex pass also keeps multi-char operators like == intact,
+        # which the old chain of str.replace calls split apart.
+        return ['<NEWLINE>' if token == '\n' else token
+                for token in _TOKEN_RE.findall(code)]
+    
+    def train(self, code_samples: List[str]) -> None:
+        """
+        Train the model on a list of code samples.
+        
+        Args:
+            code_samples: List of Python code strings
+        """
+        # Hoist the attribute lookups out of the hot loop
+        n = self.n_gram_size
+        transitions = self.transitions
+        for code in code_samples:
+            tokens = self.tokenize(code)
+
+            # Count token frequencies in one C-level pass
+            self.token_counts.update(tokens)
+            self.total_tokens += len(tokens)
+
+            # Build n-gram transitions
+            for i in range(len(tokens) - n):
+                transitions[tuple(tokens[i:i + n])][tokens[i + n]] += 1
+
+        # Cache each n-gram's count sum so suggest can divide on demand
+        # instead of keeping a full parallel table of probabilities
+        self.transition_totals = {
+            n_gram: sum(next_tokens.values())
+            for n_gram, next_tokens in self.transitions.items()
+        }
+        self._top_tokens = self.token_counts.most_common(32)
+
+    def suggest(self, context: str, max_suggestions: int = 3) -> List[Tuple[str, float]]:
+        """
+        Generate suggestions for code completion based on the context.
+        
+        Args:
+            context: Current code context
+            max_suggestions: Maximum number of suggestions to return
+            
+        Returns:
+            List of (suggestion, probability) tuples
+        """
+        # Tokenize the context
+        context_tokens = self.tokenize(context)
+        
+        # If we don't have enough context tokens, return the most common tokens
+        if len(context_tokens) < self.n_gram_size:
+            return self._most_common_tokens(max_suggestions)
+
+        # Get the most recent n-gram
+        recent_n_gram = tuple(context_tokens[-self.n_gram_size:])
+
+        # If we haven't seen this n-gram, return the most common tokens
+        if recent_n_gram not in self.transitions:
+            return self._most_common_tokens(max_suggestions)
+
+        # Rank the next tokens; most_common is a heap-based C routine
+        next_tokens = self.transitions[recent_n_gram]
+        total = self.transition_totals.get(recent_n_gram) or sum(next_tokens.values())
+        return [(token, count / total)
+                for token, count in next_tokens.most_common(max_suggestions)]
+
+    def _most_common_tokens(self, max_suggestions: int) -> List[Tuple[str, float]]:
+        """Fall back to the globally most frequent tokens."""
+        if not self.token_counts:
+            return []
+        # The head is precomputed at train/load time; only re-rank when a
+        # caller asks for more entries than were cached
+        top = self._top_tokens
+        if max_suggestions > len(top) and len(top) < len(self.token_counts):
+            top = self.token_counts.most_common(max_suggestions)
+        return [(token, count / self.total_tokens)
+                for token, count in top[:max_suggestions]]
+
+    def suggest_completion(self, context: str, max_length: int = 10) -> str:
+        """
+        Greedily generate a multi-token completion for the given context.
+
+        Args:
+            context: Current code context
+            max_length: Maximum number of tokens to generate
+
+        Returns:
+            The suggested continuation as a space-joined string
+        """
+        tokens = self.tokenize(context)
+        if len(tokens) < self.n_gram_size:
+            return ""
+
+        # Rolling window of the last n tokens; the deque drops the oldest
+        # entry itself, so each step costs O(n-gram) work
+        window = deque(tokens[-self.n_gram_size:], maxlen=self.n_gram_size)
+
+        suggestion = []
+        for _ in range(max_length):
+            candidates = self.transitions.get(tuple(window))
+            if not candidates:
+                break
+
+            # Choose the most frequent next token
+            next_token = candidates.most_common(1)[0][0]
+            suggestion.append(next_token)
+            window.append(next_token)
+
+        return ' '.join(suggestion)
+    
+    def save(self, file_path: str) -> bool:
+        """
+        Save the model to a file.
+        
+        Args:
+            file_path: Path to save the model
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # Pickle keeps the tuple keys and Counters natively, avoiding
+            # the join/split round trip (and 2x file size) of indented JSON
+            model_data = {
+                "n_gram_size": self.n_gram_size,
+                "transitions": dict(self.transitions),
+                "token_counts": self.token_counts,
+                "total_tokens": self.total_tokens
+            }
+
+            directory = os.path.dirname(file_path)
+            if directory:
+                ensure_directory_exists(directory)
+
+            with open(file_path, 'wb') as f:
+                pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving model to {file_path}: {e}")
+            return False
+    
+    @classmethod
+    def load(cls, file_path: str) -> Optional['CodeSuggestionModel']:
+        """
+        Load the model from a file.
+        
+        Args:
+            file_path: Path to load the model from
+            
+        Returns:
+            The loaded model or None if loading failed
+        """
+        try:
+            try:
+                with open(file_path, 'rb') as f:
+                    model_data = pickle.load(f)
+                transitions = model_data.get("transitions", {})
+            except (pickle.UnpicklingError, UnicodeDecodeError, EOFError, FileNotFoundError):
+                # Fall back to the legacy JSON layout with comma-joined keys
+                model_data = load_json_file(file_path)
+                if not model_data:
+                    return None
+                transitions = {
+                    tuple(n_gram.split(',')): next_tokens
+                    for n_gram, next_tokens in model_data.get("transitions", {}).items()
+                }
+
+            # Create a new model instance
+            model = cls(n_gram_size=model_data.get("n_gram_size", 3))
+
+            # Load transitions
+            model.transitions = defaultdict(Counter, {
+                n_gram: Counter(next_tokens)
+                for n_gram, next_tokens in transitions.items()
+            })
+
+            # Load token counts
+            model.token_counts = Counter(model_data.get("token_counts", {}))
+            model.total_tokens = model_data.get("total_tokens", 0)
+
+            # Rebuild the per-n-gram denominators
+            model.transition_totals = {
+                n_gram: sum(next_tokens.values())
+                for n_gram, next_tokens in model.transitions.items()
+            }
+            model._top_tokens = model.token_counts.most_common(32)
+
+            return model
+        except Exception as e:
+            logger.error(f"Error loading model from {file_path}: {e}")
+            return None
+
+def load_code_model(file_path: str = 'code_model.bin') -> 'CodeSuggestionModel':
+    """
+    Load the code suggestion model, or create a fresh one.
+
+    Args:
+        file_path: Path to the persisted model
+
+    Returns:
+        The loaded model, or a new untrained model if loading failed
+    """
+    model = CodeSuggestionModel.load(file_path)
+    return model if model is not None else CodeSuggestionModel()
+
+def save_code_model(model: 'CodeSuggestionModel', file_path: str = 'code_model.bin') -> bool:
+    """
+    Save the code suggestion model.
+
+    Args:
+        model: The model to persist
+        file_path: Path to save the model to
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return model.save(file_path)
+
+class DotDict(dict):
+    """
+    A dictionary that allows dot notation access to its items.
+    This makes template formatting cleaner in the generate_code method.
+    """
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            return ""
+
+    def __missing__(self, key):
+        return ""
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        try:
+            del self[key]
+        except KeyError:
+            pass
+
+def format_error_message(error: Exception, block_type: str = "") -> str:
+    """
+    Format an error message for display to the user.
+    
+    Args:
+        error: The exception that occurred
+        block_type: The type of block where the error occurred
+        
+    Returns:
+        A formatted error message string
+    """
+    prefix = f"Error in {block_type}: " if block_type else "Error: "
+    return f"{prefix}{str(error)}"
+
+def safely_format_template(template: str, context: dict) -> str:
+    """
+    Safely format a template string with a context dictionary.
+    
+    Args:
+        template: The template string to format
+        context: The context dictionary with values
+        
+    Returns:
+        The formatted string or an error message
+    """
+    try:
+        return template.format_map(DotDict(context))
+    except Exception as e:
+        logger.error(f"Error formatting template: {str(e)}")
+        return f"# Error formatting template: {str(e)}"
+
+def is_variable_reference(value: str) -> bool:
+    """
+    Check if a string looks like a variable reference.
+    
+    Args:
+        value: The string to check
+        
+    Returns:
+        True if the string looks like a variable reference
+    """
+    if not value:
+        return False
+
+    # Check if it has quotes (string literal)
+    if value[0] in '"\'':
+        return False
+
+    # Check if it's a digit (number literal)
+    if value.isdigit():
+        return False
+
+    # Check for expressions with operators
+    if _OPERATOR_SEARCH(value):
+        return False
+
+    # Check for valid variable naming pattern (allowing underscores)
+    return _IDENT_MATCH(value) is not None
+
+def apply_safe_quote_rules(value: str, data_type: str = "string") -> str:
+    """
+    Apply quoting rules to a value based on its context and type.
+    
+    Args:
+        value: The value to potentially quote
+        data_type: The expected data type
+        
+    Returns:
+        The value, potentially with quotes added
+    """
+    # If already quoted, keep as is
+    if value.startswith('"') or value.startswith("'"):
+        return value
+        
+    # For string type, check if this is a variable reference
+    if data_type == "string":
+        if is_variable_reference(value):
+            return value
+        else:
+            # Add quotes for strings that aren't variable references
+            return f'"{value}"'
+    
+    # For other types, don't add quotes
     return value 
\ No newline at end of file